@@ -0,0 +1,121 @@
+import time
+import struct
+import argparse
+
+from datetime import datetime, timezone
+
+from Utility.Logger import Logger
+from Strategy.Api import IdReceive, IdSend, Sentinel, ReceiveCodecs, HeaderCodec
+from Strategy.Machine import Machine
+from Strategy.Strategy import Strategy
+from Strategy.Transport import LoopbackTransport
+
+Events = [
+    (IdReceive.Bar.value, (1704067200000, 1.1, 1.2, 1.0, 1.15, 100)),
+    (IdReceive.BidAboveTarget.value, (1.12,)),
+    (IdReceive.ModifiedBuyStopLoss.value, (1000.0, 1.1, 1.05, Sentinel)),
+    (IdReceive.Account.value, (10000.0, 10050.0)),
+]
+
+
+def create_stream(events):
+    stream = bytearray()
+    for i in range(events):
+        call, content = Events[i % len(Events)]
+        stream += HeaderCodec.pack(call) + ReceiveCodecs[call].pack(*content)
+    stream += HeaderCodec.pack(IdReceive.Shutdown.value)
+    return bytes(stream)
+
+
+class Bench(Strategy):
+
+    def create_signal_management(self):
+        machine = Machine("Bench", self.symbol, self.timeframe, self.logger)
+
+        start = machine.create_state(name="Start", end=False)
+        end = machine.create_state(name="End", end=True)
+
+        start.on_bar(action=self.count_action, to=start, reason=None)
+        start.on_bid_above_target(action=self.count_action, to=start, reason=None)
+        start.on_shutdown(action=None, to=end, reason=None)
+
+        return machine
+
+    def count_action(self, *args):
+        pass
+
+
+class Legacy(Bench):
+
+    def run(self):
+        while not (self.risk_machine.at.end and self.signal_machine.at.end):
+            call = self.__unpack("<1b")[0]
+            match call:
+                case IdReceive.Shutdown.value:
+                    callback, *callback_args = self.__call_layered(self.signal_machine.call_shutdown, self.risk_machine.call_shutdown)
+                case IdReceive.Account.value:
+                    callback, *callback_args = self.__call_layered(self.signal_machine.call_account, self.risk_machine.call_account, *self.__unpack("<2d"))
+                case IdReceive.ModifiedBuyStopLoss.value:
+                    content = self.__unpack("<4d")
+                    sl = content[2] if content[2] is not Sentinel else None
+                    tp = content[3] if content[3] is not Sentinel else None
+                    callback, *callback_args = self.__call_layered(self.signal_machine.call_modified_buy_stop_loss, self.risk_machine.call_modified_buy_stop_loss, content[0], content[1], sl, tp)
+                case IdReceive.Bar.value:
+                    content = self.__unpack("<1q4d1q")
+                    date = datetime.fromtimestamp(content[0] / 1000.0, tz=timezone.utc)
+                    callback, *callback_args = self.__call_layered(self.signal_machine.call_bar, self.risk_machine.call_bar, date, *content[1:])
+                case IdReceive.BidAboveTarget.value:
+                    callback, *callback_args = self.__call_layered(self.signal_machine.call_bid_above_target, self.risk_machine.call_bid_above_target, self.__unpack("<1d")[0])
+            match callback:
+                case IdSend.Complete.value:
+                    self.transport.send(struct.pack("<1b", IdSend.Complete.value))
+
+    def __unpack(self, size):
+        buffer = bytearray(struct.calcsize(size))
+        self.transport.recv_into(memoryview(buffer))
+        return struct.unpack(size, buffer)
+
+    @staticmethod
+    def __call_layered(signal_call, risk_call, *call_args):
+        signal_return = signal_call(*call_args)
+        risk_return = risk_call(*call_args)
+        if signal_return is not None:
+            callback, *callback_args = signal_return
+            return callback, *callback_args
+        if risk_return is not None:
+            callback, *callback_args = risk_return
+            return callback, *callback_args
+        return IdSend.Complete.value, None
+
+
+def measure(label, events, function):
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<8} {events / elapsed:>14,.0f} events/sec {elapsed / events * 1e9:>10,.0f} ns/event")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, help="Number of synthetic events", default=200000)
+    args = parser.parse_args()
+
+    logger = Logger("ERROR")
+    stream = create_stream(args.events)
+
+    client, server = LoopbackTransport.pair()
+    server.send(stream)
+    legacy = Legacy("0", "BENCH", "Minute", logger, transport=client)
+    before = measure("Before", args.events, legacy.run)
+
+    client, server = LoopbackTransport.pair()
+    server.send(stream)
+    current = Bench("0", "BENCH", "Minute", logger, transport=client)
+    after = measure("After", args.events, current.run)
+
+    print(f"Speedup  {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
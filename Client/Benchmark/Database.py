@@ -0,0 +1,106 @@
+import time
+import shutil
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+from Utility.Logger import Logger
+from Database.Database import Database
+
+
+def create_frame(start, count):
+    dates = pd.date_range(start, periods=count, freq="min", tz="UTC", name="Date")
+    close = 1.1 + np.cumsum(np.random.default_rng(count).normal(0.0, 1e-4, count))
+    return pd.DataFrame({"Open": close, "High": close + 1e-4, "Low": close - 1e-4, "Close": close, "Volume": np.arange(count, dtype=np.int64)}, index=dates)
+
+
+class Legacy(Database):
+
+    def save_data(self, data: pd.DataFrame):
+        with pd.HDFStore(self.file_path, complevel=9, mode="a") as store:
+            if self.name in store:
+                data = pd.concat([store[self.name], data])
+            data = data.reset_index().drop_duplicates(subset="Date", keep="last").set_index("Date").sort_index()
+            store.put(self.name, data, format="table", data_columns=True)
+
+
+class Indexed(Database):
+
+    def save_data(self, data: pd.DataFrame):
+        data = data.reset_index().drop_duplicates(subset="Date", keep="last").set_index("Date").sort_index()
+        data.index = data.index.as_unit("ns")
+        with pd.HDFStore(self.file_path, complevel=self.complevel, mode="a") as store:
+            if self.name in store:
+                coordinates = store.select_as_coordinates(self.name, where=f"index >= '{data.index[0]}'")
+                if len(coordinates):
+                    overlap = store.select(self.name, where=coordinates)
+                    store.remove(self.name, start=int(coordinates[0]))
+                    data = pd.concat([overlap, data]).reset_index().drop_duplicates(subset="Date", keep="last").set_index("Date").sort_index()
+            store.append(self.name, data, format="table", data_columns=self.data_columns, index=False)
+            store.create_table_index(self.name, columns=["index"], kind="full")
+
+    def load_data(self, start=None, end=None, head=None, tail=None, columns=None):
+        where = [f"index {operator} '{pd.Timestamp(value)}'" for operator, value in ((">=", start), ("<=", end)) if value is not None]
+        rows = slice(-tail if tail else None, head)
+        with pd.HDFStore(self.file_path, mode="r") as store:
+            if not where:
+                begin, stop, _ = rows.indices(store.get_storer(self.name).nrows)
+                return store.select(self.name, start=begin, stop=max(begin, stop), columns=columns)
+            return store.select(self.name, where=store.select_as_coordinates(self.name, where=where)[rows], columns=columns)
+
+
+def measure(database, existing, bars, overlap, repeats):
+    database.save_data(existing)
+    elapsed = 0.0
+    for i in range(repeats):
+        data = create_frame(existing.index[-1] + pd.Timedelta(minutes=1 + i * bars - overlap), bars + overlap)
+        start = time.perf_counter()
+        database.save_data(data)
+        elapsed += time.perf_counter() - start
+    return elapsed / repeats
+
+
+def measure_load(database, **query):
+    start = time.perf_counter()
+    database.load_data(**query)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", help="Existing rows per file", default=[10000, 100000, 1000000])
+    parser.add_argument("--bars", type=int, help="New bars per save", default=50)
+    parser.add_argument("--overlap", type=int, help="Stored bars resent with each save", default=0)
+    parser.add_argument("--repeats", type=int, help="Saves per measurement", default=5)
+    args = parser.parse_args()
+
+    logger = Logger("ERROR")
+    root = tempfile.mkdtemp()
+    try:
+        print(f"{'Rows':>10} {'Legacy':>12} {'Indexed':>12} {'Current':>12} {'Speedup':>9}")
+        loads = []
+        for size in args.sizes:
+            existing = create_frame("2014-01-01", size)
+            legacy = measure(Legacy("Legacy", f"BENCH{size}", "Minute", logger, root=root), existing, args.bars, args.overlap, args.repeats)
+            indexed = Indexed("Indexed", f"BENCH{size}", "Minute", logger, root=root)
+            current = Database("Current", f"BENCH{size}", "Minute", logger, root=root)
+            timings = [measure(database, existing, args.bars, args.overlap, args.repeats) for database in (indexed, current)]
+            print(f"{size:>10,} {legacy * 1e3:>9,.1f} ms {timings[0] * 1e3:>9,.1f} ms {timings[1] * 1e3:>9,.1f} ms {legacy / timings[1]:>8.1f}x")
+            middle = existing.index[size // 2]
+            queries = {
+                "tail=100": dict(tail=100),
+                "start/end 1000": dict(start=middle, end=existing.index[size // 2 + 999]),
+                "start, head=100": dict(start=middle, head=100),
+                "end, tail=100": dict(end=middle, tail=100),
+            }
+            loads += [(size, label, *(measure_load(database, **query) for database in (indexed, current))) for label, query in queries.items()]
+        print(f"{'Rows':>10} {'Load':<16} {'Indexed':>12} {'Current':>12}")
+        for size, label, indexed, current in loads:
+            print(f"{size:>10,} {label:<16} {indexed * 1e3:>9,.1f} ms {current * 1e3:>9,.1f} ms")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
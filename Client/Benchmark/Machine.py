@@ -0,0 +1,83 @@
+import time
+import argparse
+import tempfile
+
+from Utility.Logger import Logger
+from Database.Database import Database
+from Strategy.Api import IdReceive
+from Strategy.State import Transitions
+from Strategy.Transport import LoopbackTransport
+from NNFX import NNFX
+
+Position = (10000.0, 1.1, 1.09, None)
+
+Events = [
+    (IdReceive.OpenedBuy.value, Position),
+    (IdReceive.BidAboveTarget.value, (1.101,)),
+    (IdReceive.ModifiedBuyVolume.value, Position),
+    (IdReceive.ModifiedBuyStopLoss.value, Position),
+    (IdReceive.BidAboveTarget.value, (1.102,)),
+    (IdReceive.ModifiedBuyStopLoss.value, Position),
+    (IdReceive.BidAboveTarget.value, (1.103,)),
+    (IdReceive.ModifiedBuyStopLoss.value, Position),
+    (IdReceive.ClosedBuy.value, Position),
+]
+
+
+class Legacy:
+
+    def __init__(self, machine):
+        self.name = machine.name
+        self.logger = machine.logger
+        self.at = machine.states[0]
+
+    def __call(self, transition, *args):
+        if transition is not None:
+            ret = transition.action(*args) if transition.action is not None else None
+            if transition.reason is not None:
+                self.logger.info(f"Machine {self.name}: [{self.at.name}] > {transition.reason} > [{transition.to.name}]")
+            self.at = transition.to
+            return ret
+
+    def call(self, event, *args):
+        return self.__call(getattr(self.at, Transitions[event]), *args)
+
+
+def dispatch(machine, events):
+    call = machine.call
+    for event, args in events:
+        call(event, *args)
+
+
+def measure(label, events, function, repeat=5):
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    print(f"{label:<8} {events / elapsed:>14,.0f} events/sec {elapsed / events * 1e9:>10,.0f} ns/event")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, help="Number of risk machine events", default=900000)
+    parser.add_argument("--verbose", type=str, help="Logging verbose level", default="Error", choices=["Error", "Warning", "Info", "Debug"])
+    args = parser.parse_args()
+
+    logger = Logger(args.verbose.upper())
+    events = Events * (args.events // len(Events))
+    with tempfile.TemporaryDirectory() as root:
+        client, _ = LoopbackTransport.pair()
+        strategy = NNFX(Database("OHLCV", "BENCH", "Minute", logger, root=root), "0", "BENCH", "Minute", logger, client)
+        strategy.symbol_pip_size = 0.0001
+        strategy.current_atr_value = 0.001
+
+        before = measure("Before", len(events), lambda: dispatch(Legacy(strategy.risk_machine), events))
+        after = measure("After", len(events), lambda: dispatch(strategy.risk_machine, events))
+
+    print(f"Speedup  {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import io
+import time
+import argparse
+import warnings
+import contextlib
+import pandas as pd
+
+from Optimisation.Optimisation import Optimisation
+from Optimisation.Memo import Memo
+from Optimisation.Search import Searchers
+from Optimisation.Baseline import BaselineIndicators, BaselineStrategy, BaselineMetric
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbol", type=str, help="Symbol of the stored history", default="EURUSD")
+    parser.add_argument("--timeframe", type=str, help="Timeframe of the stored history", default="Hour")
+    parser.add_argument("--bars", type=int, help="Most recent bars to backtest", default=3000)
+    parser.add_argument("--passes", type=int, help="Pass budget per indicator for budgeted searchers", default=15)
+    parser.add_argument("--seed", type=int, help="Searcher random seed", default=0)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    data = pd.read_hdf(f"Database/Data/{args.symbol.upper()}/{args.timeframe.capitalize()}/OHLCV.h5").iloc[-args.bars:]
+
+    print(f"{'Search':<8} {'Indicator':>10} {'Parameters':>20} {'SQN':>8} {'Passes':>7} {'Grid':>6} {'Elapsed':>9}")
+    for name, searcher in {"Grid": None, **Searchers}.items():
+        search = searcher(passes=args.passes, seed=args.seed) if searcher is not None else None
+        optimisation = Optimisation("Baseline", data, BaselineStrategy, BaselineIndicators, BaselineMetric, memo=Memo(), search=search)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, indicator, parameters = optimisation.run()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<8} {indicator:>10} {str(parameters):>20} {optimisation.optimal_stats['SQN']:>8.3f} {optimisation.passes:>7} {optimisation.grid_size:>6} {elapsed:>8.1f}s")
+
+
+if __name__ == "__main__":
+    main()
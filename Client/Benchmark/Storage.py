@@ -0,0 +1,50 @@
+import time
+import shutil
+import argparse
+import tempfile
+import pandas as pd
+
+from Utility.Logger import Logger
+from Database.Database import Database
+from Database.Parquet import ParquetDatabase
+from Benchmark.Database import create_frame
+
+
+def measure(function, rows):
+    start = time.perf_counter()
+    data = function()
+    elapsed = time.perf_counter() - start
+    rows = rows if data is None else len(data)
+    return f"{elapsed * 1e3:>9,.1f} ms {rows / elapsed / 1e6:>7,.2f} Mrows/s"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, help="Minute bars in the synthetic history", default=2000000)
+    args = parser.parse_args()
+
+    logger = Logger("ERROR")
+    data = create_frame("2014-01-01", args.rows)
+    middle = data.index[len(data) // 2]
+    root = tempfile.mkdtemp()
+    try:
+        backends = {
+            "HDF5": Database("OHLCV", "BENCH", "Minute", logger, root=root),
+            "Parquet": ParquetDatabase("OHLCV", "BENCH", "Minute", logger, root=root),
+        }
+        cases = {
+            "Write": lambda db: db.save_data(data),
+            "Read all": lambda db: db.load_data(),
+            "Read close": lambda db: db.load_data(columns=["Close"]),
+            "Read month": lambda db: db.load_data(start=middle, end=middle + pd.Timedelta(days=30)),
+            "Read tail": lambda db: db.load_data(tail=1000),
+        }
+        print(f"{'Case':<12}" + "".join(f"{name:>29}" for name in backends))
+        for case, function in cases.items():
+            print(f"{case:<12}" + "".join(f"{measure(lambda: function(db), len(data)):>29}" for db in backends.values()))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import time
+import talib
+import argparse
+import warnings
+import numpy as np
+import pandas as pd
+
+from backtesting import Backtest
+
+from Optimisation.Optimisation import Optimisation
+from Optimisation.Vectorized import VectorizedBacktest
+from Optimisation.Baseline import BaselineIndicators, BaselineStrategy
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbol", type=str, help="Symbol of the stored history", default="EURUSD")
+    parser.add_argument("--timeframe", type=str, help="Timeframe of the stored history", default="Hour")
+    parser.add_argument("--bars", type=int, help="Most recent bars to backtest", default=5000)
+    parser.add_argument("--step", type=int, help="Stride through each parameter range for the reference runs", default=5)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    data = pd.read_hdf(f"Database/Data/{args.symbol.upper()}/{args.timeframe.capitalize()}/OHLCV.h5").iloc[-args.bars:]
+    engine = VectorizedBacktest(data, Optimisation.capital)
+    atr = talib.ATR(data.High.to_numpy(dtype=float), data.Low.to_numpy(dtype=float), data.Close.to_numpy(dtype=float), timeperiod=BaselineStrategy.atr_timeperiod)
+    warmup = int(np.isnan(atr).argmin())
+
+    print(f"{'Indicator':<10} {'Runs':>5} {'Mismatches':>11} {'Max error':>11} {'Backtest':>12} {'Vectorized':>12}")
+    for indicator in BaselineIndicators:
+        name = indicator["name"]
+        parameter, values = next(iter(indicator["ranges"].items()))
+        values = values[::args.step]
+        Optimisation.configure_strategy(BaselineStrategy, indicator)
+
+        start = time.perf_counter()
+        close = data.Close.to_numpy(dtype=float)
+        result = engine.run(np.column_stack([getattr(talib, name)(close, **{parameter: value}) for value in values]), warmup)
+        vectorized = [engine.stats(result, column, {parameter: value}) for column, value in enumerate(values)]
+        vectorized_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        backtest = Backtest(data=data, strategy=BaselineStrategy, cash=Optimisation.capital)
+        reference = [backtest.run(**{parameter: value}) for value in values]
+        reference_elapsed = time.perf_counter() - start
+
+        mismatches, error = 0, 0.0
+        for expected, actual in zip(reference, vectorized):
+            for key, value in actual.items():
+                if key.startswith("_"):
+                    continue
+                if isinstance(value, float) and (np.isnan(value) or np.isnan(expected[key])):
+                    mismatches += np.isnan(value) != np.isnan(expected[key])
+                elif isinstance(value, float):
+                    error = max(error, abs(value - expected[key]) / max(1.0, abs(expected[key])))
+                    mismatches += not np.isclose(value, expected[key], rtol=1e-9, atol=1e-9)
+                else:
+                    mismatches += value != expected[key]
+        print(f"{name:<10} {len(values):>5} {mismatches:>11} {error:>11.2e} {reference_elapsed * 1e3:>9,.0f} ms {vectorized_elapsed * 1e3:>9,.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
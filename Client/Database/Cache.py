@@ -0,0 +1,60 @@
+import os
+import glob
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+
+
+class Cache:
+
+    def __init__(self, db, logger, root=None):
+        self.db = db
+        self.logger = logger
+
+        self.root = root if root is not None else os.path.join(os.path.dirname(os.path.abspath(__file__)), "Cache")
+        self.folder_path = os.path.join(self.root, db.symbol, db.timeframe, db.name)
+        os.makedirs(self.folder_path, exist_ok=True)
+
+    def store(self, start=None, end=None):
+        version = self.__version()
+        key = hashlib.sha1(f"{start}|{end}".encode()).hexdigest()[:16]
+        path = os.path.join(self.folder_path, f"{version}_{key}")
+        if os.path.isdir(path):
+            return path
+        for stale_path in glob.glob(os.path.join(self.folder_path, "*_*")):
+            if not os.path.basename(stale_path).startswith(f"{version}_"):
+                shutil.rmtree(stale_path, ignore_errors=True)
+        data = self.db.load_data(start=start, end=end)
+        temp_path = f"{path}_{os.getpid()}_temp"
+        self.write(temp_path, data)
+        try:
+            os.rename(temp_path, path)
+        except OSError:
+            shutil.rmtree(temp_path)
+        self.logger.info(f"Cache {self.db.symbol} {self.db.timeframe} {self.db.name}: [Stored : {len(data)}]")
+        return path
+
+    def load_data(self, start=None, end=None):
+        return self.open(self.store(start, end))
+
+    @staticmethod
+    def write(path, data):
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "Date.npy"), data.index.as_unit("ns").asi8)
+        np.save(os.path.join(path, "Columns.npy"), np.array(data.columns, dtype=str))
+        for column in data.columns:
+            np.save(os.path.join(path, f"{column}.npy"), np.ascontiguousarray(data[column].to_numpy()))
+
+    @staticmethod
+    def open(path):
+        columns = np.load(os.path.join(path, "Columns.npy"))
+        dates = np.load(os.path.join(path, "Date.npy"), mmap_mode="r")
+        index = pd.DatetimeIndex(dates.view("datetime64[ns]"), name="Date").tz_localize("UTC")
+        values = {column: np.load(os.path.join(path, f"{column}.npy"), mmap_mode="r") for column in columns}
+        return pd.DataFrame(values, index=index, copy=False)
+
+    def __version(self):
+        source_path = getattr(self.db, "file_path", None) or self.db.folder_path
+        paths = [source_path] if os.path.isfile(source_path) else glob.glob(os.path.join(source_path, "**", "*"), recursive=True)
+        return max((os.stat(path).st_mtime_ns for path in paths), default=0)
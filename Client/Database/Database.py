@@ -1,45 +1,118 @@
 import os
+import bisect
+import functools
+import threading
 import pandas as pd
 
+HDF5Lock = threading.RLock()
+
+
+def serialised(method):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with HDF5Lock:
+            return method(*args, **kwargs)
+    return wrapper
+
 
 class Database:
 
-    def __init__(self, name, symbol, timeframe, logger):
+    def __init__(self, name, symbol, timeframe, logger, root=None, compact_ratio=0.25, data_columns=True, complevel=9):
         self.name = name
         self.symbol = symbol
         self.timeframe = timeframe
         self.logger = logger
+        self.compact_ratio = compact_ratio
+        self.data_columns = data_columns
+        self.complevel = complevel
 
-        self.folder_path = f"{os.path.dirname(os.path.abspath(__file__))}\\Data\\{self.symbol}\\{self.timeframe}"
-        self.file_path = f"{self.folder_path}\\{self.name}.h5"
+        self.root = root if root is not None else os.path.join(os.path.dirname(os.path.abspath(__file__)), "Data")
+        self.folder_path = os.path.join(self.root, self.symbol, self.timeframe)
+        self.file_path = os.path.join(self.folder_path, f"{self.name}.h5")
         os.makedirs(self.folder_path, exist_ok=True)
 
+    @serialised
     def save_data(self, data: pd.DataFrame):
-        with pd.HDFStore(self.file_path, complevel=9, mode="a") as store:
-            existing_count = 0
+        if data.empty:
+            return
+        data = data.reset_index().drop_duplicates(subset="Date", keep="last").set_index("Date").sort_index()
+        data.index = data.index.as_unit("ns")
+        with pd.HDFStore(self.file_path, complevel=self.complevel, mode="a") as store:
+            if self.name not in store:
+                self.__put(store, self.name, data, self.data_columns)
+                self.logger.info(f"Database {self.symbol} {self.timeframe} {self.name}: [Saved: {len(data)} | Updated: 0 | Total: {len(data)}]")
+                return
+            if not store.get_storer(self.name).is_table:
+                self.__put(store, self.name, store[self.name], self.data_columns)
+            storer = store.get_storer(self.name)
+            # Rows stay sorted by Date, so seeks bisect the table instead of keeping a CSI index (see Benchmark.Database)
+            storer.table.autoindex = False
+            existing_count = storer.nrows
             saving_count = len(data)
-            if self.name in store:
-                existing_data = store[self.name]
-                existing_count = len(existing_data)
-                data = pd.concat([existing_data, data])
-            data = data.reset_index().drop_duplicates(subset="Date", keep="last").set_index("Date").sort_index()
-            store.put(self.name, data, format="table", data_columns=True)
-            total_count = len(data)
+            position = self.__position(storer, data.index[0], bisect.bisect_left)
+            if position < existing_count:
+                overlap = store.select(self.name, start=position)
+                store.remove(self.name, start=position, stop=existing_count)
+                storer.attrs.removed_count = getattr(storer.attrs, "removed_count", 0) + len(overlap)
+                data = pd.concat([overlap, data]).reset_index().drop_duplicates(subset="Date", keep="last").set_index("Date").sort_index()
+            store.append(self.name, data, format="table", data_columns=self.data_columns, index=False)
+            total_count = store.get_storer(self.name).nrows
             saved_count = total_count - existing_count
             updated_count = saving_count - saved_count
             self.logger.info(f"Database {self.symbol} {self.timeframe} {self.name}: [Saved: {saved_count} | Updated: {updated_count} | Total: {total_count}]")
 
-    def load_data(self, start=None, end=None, head=None, tail=None):
-        with pd.HDFStore(self.file_path, complevel=9, mode="r") as store:
-            data = store[self.name].loc[start:end].iloc[-tail if tail else None:head]
+    @serialised
+    def load_data(self, start=None, end=None, head=None, tail=None, columns=None):
+        rows = slice(-tail if tail else None, head)
+        with pd.HDFStore(self.file_path, mode="r") as store:
+            storer = store.get_storer(self.name)
+            if storer.is_table:
+                first = self.__position(storer, start, bisect.bisect_left) if start is not None else 0
+                last = self.__position(storer, end, bisect.bisect_right) if end is not None else storer.nrows
+                begin, stop, _ = rows.indices(max(last - first, 0))
+                data = store.select(self.name, start=first + begin, stop=first + max(begin, stop), columns=columns)
+            else:
+                data = store[self.name].loc[start:end].iloc[rows]
+                data = data[columns] if columns is not None else data
             self.logger.info(f"Database {self.symbol} {self.timeframe} {self.name}: [Loaded : {len(data)}]")
             return data
 
-    def clean_data(self):
+    @serialised
+    def last_date(self):
+        if not os.path.exists(self.file_path):
+            return None
+        with pd.HDFStore(self.file_path, mode="r") as store:
+            if self.name not in store:
+                return None
+            storer = store.get_storer(self.name)
+            if not storer.is_table:
+                index = store[self.name].index
+                return index[-1] if len(index) else None
+            if not storer.nrows:
+                return None
+            return pd.Timestamp(storer.table.read(storer.nrows - 1, storer.nrows)["index"][0], tz="UTC")
+
+    @serialised
+    def clean_data(self, force=False):
+        with pd.HDFStore(self.file_path, complevel=self.complevel, mode="r") as store:
+            storers = [store.get_storer(key) for key in store.keys()]
+            removed_count = sum(getattr(storer.attrs, "removed_count", 0) for storer in storers)
+            stored_count = sum(storer.nrows or 0 for storer in storers)
+        if not force and removed_count <= self.compact_ratio * stored_count:
+            return
         temp_path = f"{self.file_path}_temp"
-        with pd.HDFStore(self.file_path, complevel=9, mode="r") as store, pd.HDFStore(temp_path, complevel=9, mode="w") as temp_store:
+        with pd.HDFStore(self.file_path, complevel=self.complevel, mode="r") as store, pd.HDFStore(temp_path, complevel=self.complevel, mode="w") as temp_store:
             for key in store.keys():
-                temp_store[key] = store[key]
+                self.__put(temp_store, key, store[key], self.data_columns)
         os.remove(self.file_path)
         os.rename(temp_path, self.file_path)
         self.logger.info(f"Database {self.symbol} {self.timeframe} {self.name}: Cleaned and Flushed")
+
+    @staticmethod
+    def __position(storer, value, search):
+        table = storer.table
+        return search(range(storer.nrows), pd.Timestamp(value).value, key=lambda row: table.read(row, row + 1)["index"][0])
+
+    @staticmethod
+    def __put(store, key, data, data_columns):
+        store.put(key, data, format="table", data_columns=data_columns, index=False)
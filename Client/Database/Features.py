@@ -0,0 +1,123 @@
+import os
+import json
+import talib
+import inspect
+import hashlib
+import numpy as np
+import pandas as pd
+
+from Database.Database import Database
+from Database.Technical import offline_technical, StreamBars, StreamWindow
+
+
+class FeatureStore:
+
+    def __init__(self, db, indicators, logger, name="Features", probe_size=4096, convergence=40):
+        self.db = db
+        self.indicators = indicators
+        self.logger = logger
+
+        self.store = Database(name, db.symbol, db.timeframe, logger, root=db.root, data_columns=None, complevel=0)
+        self.metadata_path = os.path.join(self.store.folder_path, f"{name}.json")
+        stored = self.load_metadata().get("columns", {})
+        self.metadata = {}
+        for column, indicator in indicators.items():
+            signature = self.signature(indicator)
+            if stored.get(column, {}).get("signature") == signature:
+                self.metadata[column] = stored[column]
+            else:
+                self.metadata[column] = {**self.probe(indicator, probe_size, convergence), "signature": signature}
+
+    @staticmethod
+    def signature(indicator):
+        try:
+            source = inspect.getsource(indicator).strip()
+        except (OSError, TypeError):
+            source = indicator.__code__.co_code.hex()
+        return hashlib.sha1(source.encode()).hexdigest()
+
+    @staticmethod
+    def probe(indicator, probe_size, convergence):
+        probe = StreamWindow.probe_bars(probe_size)
+        lookback = StreamWindow.lookback(indicator, probe) + 1
+        if not StreamWindow.bounded(indicator, probe_size):
+            lookback = min(convergence * lookback, probe_size)
+        full = np.asarray(indicator(talib, StreamBars(*probe)), dtype=float)[-lookback:]
+        tail = np.asarray(indicator(talib, StreamBars(*(column[-lookback:] for column in probe))), dtype=float)
+        difference = full - tail
+        difference = difference[~np.isnan(difference)]
+        cumulative = bool(len(difference)) and abs(difference[-1]) > 1e-9 * np.nanmax(np.abs(full)) and np.allclose(difference, difference[-1], rtol=1e-9, atol=0.0)
+        return {"lookback": lookback, "cumulative": bool(cumulative)}
+
+    def load_metadata(self):
+        if not os.path.exists(self.metadata_path):
+            return {}
+        with open(self.metadata_path) as file:
+            return json.load(file)
+
+    def save_metadata(self, end):
+        temp_path = f"{self.metadata_path}_temp"
+        with open(temp_path, "w") as file:
+            json.dump({"end": str(end), "columns": self.metadata}, file, indent=4)
+        os.replace(temp_path, self.metadata_path)
+
+    def save_data(self, data: pd.DataFrame):
+        self.db.save_data(data)
+        self.update(since=data.index.min())
+
+    def load_data(self, start=None, end=None, head=None, tail=None, columns=None):
+        self.update()
+        return self.store.load_data(start=start, end=end, head=head, tail=tail, columns=columns)
+
+    def update(self, since=None):
+        stored = self.load_metadata()
+        if list(stored.get("columns", {})) != list(self.metadata) or stored.get("columns") != self.metadata or not os.path.exists(self.store.file_path):
+            return self.rebuild()
+        stored_end = pd.Timestamp(stored["end"])
+        if since is None:
+            if self.db.last_date() <= stored_end:
+                return
+            start = stored_end
+        else:
+            start = min(pd.Timestamp(since), stored_end)
+
+        lookback = max(column["lookback"] for column in self.metadata.values())
+        history = self.db.load_data(end=start, tail=lookback + 1)
+        history = history[history.index < start]
+        fresh = self.db.load_data(start=start)
+        if not len(fresh):
+            return
+        market = pd.concat([history, fresh])
+
+        groups = {}
+        for column, metadata in self.metadata.items():
+            groups.setdefault(metadata["lookback"], []).append(column)
+        computed = {}
+        for size, columns in groups.items():
+            window = market.iloc[max(len(history) - size, 0):]
+            computed[size] = offline_technical(window, {column: self.indicators[column] for column in columns})
+        data = pd.concat([frame.iloc[-len(fresh):] for frame in computed.values()], axis=1)[list(self.metadata)]
+
+        anchored = [column for column, metadata in self.metadata.items() if metadata["cumulative"]]
+        if anchored and len(history):
+            anchor = history.index[-1]
+            stored_values = self.store.load_data(start=anchor, end=anchor, columns=anchored)
+            if len(stored_values):
+                for column in anchored:
+                    data[column] += stored_values[column].iloc[-1] - computed[self.metadata[column]["lookback"]].at[anchor, column]
+            else:
+                self.logger.warning(f"Features {self.db.symbol} {self.db.timeframe} {self.store.name}: Anchor {anchor} missing, recomputing cumulative columns")
+                data[anchored] = offline_technical(self.db.load_data(end=fresh.index[-1]), {column: self.indicators[column] for column in anchored}).iloc[-len(fresh):]
+
+        self.store.save_data(data)
+        self.save_metadata(data.index[-1])
+        self.logger.info(f"Features {self.db.symbol} {self.db.timeframe} {self.store.name}: [Recomputed: {len(data)} | Lookback: {lookback}]")
+
+    def rebuild(self):
+        if os.path.exists(self.store.file_path):
+            os.remove(self.store.file_path)
+        market = self.db.load_data()
+        data = offline_technical(market, self.indicators)
+        self.store.save_data(data)
+        self.save_metadata(data.index[-1])
+        self.logger.info(f"Features {self.db.symbol} {self.db.timeframe} {self.store.name}: [Rebuilt: {len(data)} | Columns: {len(self.metadata)}]")
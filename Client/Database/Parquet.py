@@ -0,0 +1,126 @@
+import os
+import glob
+import shutil
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+
+class ParquetDatabase:
+
+    def __init__(self, name, symbol, timeframe, logger, root=None, threads=True):
+        self.name = name
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.logger = logger
+        self.threads = threads
+
+        self.root = root if root is not None else os.path.join(os.path.dirname(os.path.abspath(__file__)), "Data")
+        self.folder_path = os.path.join(self.root, self.symbol, self.timeframe, self.name)
+        os.makedirs(self.folder_path, exist_ok=True)
+
+    def save_data(self, data: pd.DataFrame):
+        data = data.reset_index().drop_duplicates(subset="Date", keep="last").set_index("Date").sort_index()
+        data.index = data.index.as_unit("ns")
+        existing_count = self.__count(self.__files())
+        for (year, month), partition in data.groupby([data.index.year, data.index.month]):
+            partition_path = self.__partition_path(year, month)
+            files = self.__fragments(partition_path)
+            if files and partition.index[0] <= self.__last_date(files[-1]):
+                stored = pd.concat([self.__read(files, None, None), partition])
+                self.__replace(partition_path, stored.reset_index().drop_duplicates(subset="Date", keep="last").set_index("Date").sort_index())
+            else:
+                self.__write(partition_path, len(files), partition)
+        total_count = self.__count(self.__files())
+        saved_count = total_count - existing_count
+        updated_count = len(data) - saved_count
+        self.logger.info(f"Database {self.symbol} {self.timeframe} {self.name}: [Saved: {saved_count} | Updated: {updated_count} | Total: {total_count}]")
+
+    def load_data(self, start=None, end=None, head=None, tail=None, columns=None):
+        start = self.__timestamp(start) if start is not None else None
+        end = self.__timestamp(end) if end is not None else None
+        condition = None
+        if start is not None:
+            condition = pc.field("Date") >= pa.scalar(start, type=pa.timestamp("ns", tz="UTC"))
+        if end is not None:
+            bound = pc.field("Date") <= pa.scalar(end, type=pa.timestamp("ns", tz="UTC"))
+            condition = bound if condition is None else condition & bound
+        files = self.__files(start, end)
+        if tail and head is None:
+            files = self.__enough(files[::-1], condition, tail)[::-1]
+        elif head and tail is None:
+            files = self.__enough(files, condition, head)
+        data = self.__read(files, condition, columns).iloc[-tail if tail else None:head]
+        self.logger.info(f"Database {self.symbol} {self.timeframe} {self.name}: [Loaded : {len(data)}]")
+        return data
+
+    def last_date(self):
+        files = self.__files()
+        return self.__last_date(files[-1]) if files else None
+
+    def clean_data(self, force=False):
+        for partition_path in sorted(glob.glob(os.path.join(self.folder_path, "Year=*", "Month=*"))):
+            files = self.__fragments(partition_path)
+            if force or len(files) > 1:
+                self.__replace(partition_path, self.__read(files, None, None))
+        self.logger.info(f"Database {self.symbol} {self.timeframe} {self.name}: Cleaned and Flushed")
+
+    def __partition_path(self, year, month):
+        return os.path.join(self.folder_path, f"Year={year}", f"Month={month:02d}")
+
+    def __files(self, start=None, end=None):
+        first = (start.year, start.month) if start is not None else None
+        last = (end.year, end.month) if end is not None else None
+        files = []
+        for partition_path in sorted(glob.glob(os.path.join(self.folder_path, "Year=*", "Month=*"))):
+            year, month = (int(part.split("=")[1]) for part in partition_path.split(os.sep)[-2:])
+            if first is not None and (year, month) < first or last is not None and (year, month) > last:
+                continue
+            files.extend(self.__fragments(partition_path))
+        return files
+
+    def __read(self, files, condition, columns):
+        columns = ["Date", *columns] if columns is not None else None
+        if not files:
+            return pd.DataFrame(columns=columns[1:] if columns else None, index=pd.DatetimeIndex([], tz="UTC", name="Date"))
+        table = ds.dataset(files, format="parquet").to_table(columns=columns, filter=condition, use_threads=self.threads)
+        return table.to_pandas(use_threads=self.threads).set_index("Date")
+
+    def __replace(self, partition_path, data):
+        temp_path, old_path = f"{partition_path}_temp", f"{partition_path}_old"
+        self.__write(temp_path, 0, data)
+        os.rename(partition_path, old_path)
+        os.rename(temp_path, partition_path)
+        shutil.rmtree(old_path)
+
+    @staticmethod
+    def __fragments(partition_path):
+        return sorted(glob.glob(os.path.join(partition_path, "*.parquet")))
+
+    @staticmethod
+    def __write(partition_path, index, data):
+        os.makedirs(partition_path, exist_ok=True)
+        pq.write_table(pa.Table.from_pandas(data.reset_index(), preserve_index=False), os.path.join(partition_path, f"{index:06d}.parquet"), compression="zstd")
+
+    @staticmethod
+    def __timestamp(value):
+        value = pd.Timestamp(value)
+        return value.tz_localize("UTC") if value.tz is None else value.tz_convert("UTC")
+
+    @staticmethod
+    def __last_date(file):
+        return pd.Timestamp(pq.read_table(file, columns=["Date"])["Date"][-1].as_py())
+
+    @staticmethod
+    def __count(files):
+        return sum(pq.read_metadata(file).num_rows for file in files)
+
+    @staticmethod
+    def __enough(files, condition, count):
+        for i, file in enumerate(files):
+            count -= ds.dataset(file, format="parquet").count_rows(filter=condition)
+            if count <= 0:
+                return files[:i + 1]
+        return files
@@ -1,7 +1,12 @@
+import pickle
+import functools
 import pandas as pd
 import talib
 import numpy as np
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
 Indicators = {
     # ------ General Indicators ------
     "AVGPRICE": lambda lib, data: lib.AVGPRICE(data.Open, data.High, data.Low, data.Close),
@@ -106,11 +111,132 @@ def STOCHFOSC(lib, data, fastk_period, fastd_period):
     return fastk - fastd
 
 
-def offline_technical(market_data, indicators):
-    indicator_data = pd.DataFrame(index=market_data.index)
-    for name, indicator in indicators.items():
-        indicator_data[name] = indicator(talib, market_data)
-    return indicator_data
+Intermediates = {
+    "ROCR1": ((), lambda lib, data: lib.ROCR(data.Close, timeperiod=1)),
+    "MAMA": ((), lambda lib, data: lib.MAMA(data.Close, fastlimit=0.5, slowlimit=0.05)),
+    "ADX14": ((), lambda lib, data: lib.ADX(data.High, data.Low, data.Close, timeperiod=14)),
+    "RSI14": ((), lambda lib, data: lib.RSI(data.Close, timeperiod=14)),
+    "STOCHRSI14": (("RSI14",), lambda lib, data, rsi: lib.STOCHF(rsi, rsi, rsi, fastk_period=5, fastd_period=3)),
+    "FASTK5": ((), lambda lib, data: lib.STOCHF(data.High, data.Low, data.Close, fastk_period=5, fastd_period=1)[0]),
+    "FASTD5": (("FASTK5",), lambda lib, data, fastk: lib.SMA(fastk, timeperiod=3)),
+    "SLOWD5": (("FASTD5",), lambda lib, data, fastd: lib.SMA(fastd, timeperiod=3)),
+    "VAR5": ((), lambda lib, data: lib.VAR(data.Close, timeperiod=5, nbdev=1)),
+}
+
+Features = {
+    "RET": (("ROCR1",), lambda lib, data, rocr: rocr),
+    "LOGRET": (("ROCR1",), lambda lib, data, rocr: np.log(rocr)),
+    "MAMA": (("MAMA",), lambda lib, data, mama: mama[0]),
+    "FAMA": (("MAMA",), lambda lib, data, mama: mama[1]),
+    "ADX": (("ADX14",), lambda lib, data, adx: adx),
+    "ADXR": (("ADX14",), lambda lib, data, adx: ADXR(adx, timeperiod=14)),
+    "RSI": (("RSI14",), lambda lib, data, rsi: rsi),
+    "STOCHRSIOSC": (("STOCHRSI14",), lambda lib, data, stochrsi: stochrsi[0] - stochrsi[1]),
+    "STOCHOSC": (("FASTD5", "SLOWD5"), lambda lib, data, fastd, slowd: fastd - slowd),
+    "STOCHFOSC": (("FASTK5", "FASTD5"), lambda lib, data, fastk, fastd: fastk - fastd),
+    "VAR": (("VAR5",), lambda lib, data, variance: variance),
+    "STDDEV": (("VAR5",), lambda lib, data, variance: STDDEV(variance, nbdev=1)),
+}
+
+
+def ADXR(adx, timeperiod):
+    adxr = np.full(len(adx), np.nan)
+    adxr[timeperiod - 1:] = (adx[timeperiod - 1:] + adx[:len(adx) - timeperiod + 1]) / 2
+    return adxr
+
+
+def STDDEV(variance, nbdev):
+    deviation = np.sqrt(np.maximum(variance, 0.0))
+    return deviation if nbdev == 1 else deviation * nbdev
+
+
+def feature_graph(indicators):
+    features = {name: Features[name] if name in Features and indicator is Indicators.get(name) else ((), indicator) for name, indicator in indicators.items()}
+    levels = {}
+
+    def level(name):
+        if name not in levels:
+            levels[name] = 1 + max((level(dependency) for dependency in Intermediates[name][0]), default=-1)
+        return levels[name]
+
+    for dependencies, _ in features.values():
+        for dependency in dependencies:
+            level(dependency)
+    stages = [[name for name in levels if levels[name] == depth] for depth in range(max(levels.values(), default=-1) + 1)]
+    return stages, features
+
+
+def offline_technical(market_data, indicators, workers=1):
+    data = StreamBars(*(market_data[column].to_numpy(dtype=float) for column in ("Open", "High", "Low", "Close", "Volume")))
+    stages, features = feature_graph(indicators)
+    intermediates = {}
+    work = np.empty((len(features), len(market_data)))
+
+    def compute(name):
+        dependencies, function = Intermediates[name]
+        intermediates[name] = function(talib, data, *(intermediates[dependency] for dependency in dependencies))
+
+    def fill(j, name):
+        dependencies, function = features[name]
+        work[j] = function(talib, data, *(intermediates[dependency] for dependency in dependencies))
+
+    with ThreadPoolExecutor(workers) as pool:
+        for stage in stages:
+            list(pool.map(compute, stage))
+        list(pool.map(fill, range(len(features)), features))
+
+    return pd.DataFrame(work.T, index=market_data.index, columns=list(features), copy=False)
+
+
+def batch_output(work):
+    return np.ascontiguousarray(work.T)
+
+
+def batch_talib(function, values, periods):
+    work = np.empty((len(periods), len(values)))
+    for j, period in enumerate(periods):
+        work[j] = function(values, timeperiod=period)
+    return batch_output(work)
+
+
+def batch_ema_chain(values, periods, depth):
+    chain = np.empty((depth, len(periods), len(values)))
+    for j, period in enumerate(periods):
+        series = values
+        for level in range(depth):
+            series = chain[level, j] = talib.EMA(series, timeperiod=period)
+    return chain
+
+
+def batch_ema(chain):
+    return batch_output(chain[0])
+
+
+def batch_dema(chain):
+    return batch_output((2.0 * chain[0]) - chain[1])
+
+
+def batch_tema(chain):
+    return batch_output(chain[2] + ((3.0 * chain[0]) - (3.0 * chain[1])))
+
+
+EMAChains = {
+    "EMA": (1, batch_ema),
+    "DEMA": (2, batch_dema),
+    "TEMA": (3, batch_tema),
+}
+
+
+def batch_series(names, values, periods):
+    values = np.ascontiguousarray(values, dtype=float)
+    periods = [int(period) for period in periods]
+    depth = max((EMAChains[name][0] for name in names if name in EMAChains), default=0)
+    chain = batch_ema_chain(values, periods, depth) if depth else None
+    return {name: EMAChains[name][1](chain) if name in EMAChains else batch_talib(getattr(talib, name), values, periods) for name in names}
+
+
+def batch_technical(market_data, names, periods, column="Close"):
+    return batch_series(names, market_data[column].to_numpy(dtype=float), periods)
 
 
 def online_technical(market_data, indicators):
@@ -118,3 +244,1053 @@ def online_technical(market_data, indicators):
     for name, indicator in indicators.items():
         indicator_data.append(indicator(talib.stream, market_data))
     return indicator_data
+
+
+class StreamSMA:
+
+    def __init__(self, timeperiod):
+        self.timeperiod = timeperiod
+        self.window = deque(maxlen=timeperiod)
+        self.total = 0.0
+
+    def update(self, value):
+        if len(self.window) < self.timeperiod - 1:
+            self.window.append(value)
+            self.total += value
+            return np.nan
+        self.total += value
+        output = self.total / self.timeperiod
+        self.window.append(value)
+        self.total -= self.window[0]
+        return output
+
+
+class StreamEMA:
+
+    def __init__(self, timeperiod, k=None):
+        self.timeperiod = timeperiod
+        self.k = k if k is not None else 2.0 / (timeperiod + 1)
+        self.count = 0
+        self.total = 0.0
+        self.previous = np.nan
+
+    def update(self, value):
+        if self.count < self.timeperiod:
+            self.count += 1
+            self.total += value
+            if self.count < self.timeperiod:
+                return np.nan
+            self.previous = self.total / self.timeperiod
+            return self.previous
+        self.previous = ((value - self.previous) * self.k) + self.previous
+        return self.previous
+
+
+class StreamDEMA:
+
+    def __init__(self, timeperiod):
+        self.first = StreamEMA(timeperiod)
+        self.second = StreamEMA(timeperiod)
+
+    def update(self, value):
+        first = self.first.update(value)
+        if np.isnan(first):
+            return np.nan
+        second = self.second.update(first)
+        return (2.0 * first) - second
+
+
+class StreamTEMA:
+
+    def __init__(self, timeperiod):
+        self.first = StreamEMA(timeperiod)
+        self.second = StreamEMA(timeperiod)
+        self.third = StreamEMA(timeperiod)
+
+    def update(self, value):
+        first = self.first.update(value)
+        if np.isnan(first):
+            return np.nan
+        second = self.second.update(first)
+        if np.isnan(second):
+            return np.nan
+        third = self.third.update(second)
+        return third + ((3.0 * first) - (3.0 * second))
+
+
+class StreamWMA:
+
+    def __init__(self, timeperiod):
+        self.timeperiod = timeperiod
+        self.divider = (timeperiod * (timeperiod + 1)) >> 1
+        self.window = deque(maxlen=timeperiod)
+        self.period_sum = 0.0
+        self.period_sub = 0.0
+        self.trailing = 0.0
+
+    def update(self, value):
+        if len(self.window) < self.timeperiod - 1:
+            self.window.append(value)
+            self.period_sub += value
+            self.period_sum += value * len(self.window)
+            return np.nan
+        self.window.append(value)
+        self.period_sub += value
+        self.period_sub -= self.trailing
+        self.period_sum += value * self.timeperiod
+        self.trailing = self.window[0]
+        output = self.period_sum / self.divider
+        self.period_sum -= self.period_sub
+        return output
+
+
+class StreamVAR:
+
+    def __init__(self, timeperiod, nbdev=1.0):
+        self.timeperiod = timeperiod
+        self.window = deque(maxlen=timeperiod)
+        self.total = 0.0
+        self.total_square = 0.0
+
+    def update(self, value):
+        self.total += value
+        self.total_square += value * value
+        if len(self.window) < self.timeperiod - 1:
+            self.window.append(value)
+            return np.nan
+        mean = self.total / self.timeperiod
+        mean_square = self.total_square / self.timeperiod
+        self.window.append(value)
+        trailing = self.window[0]
+        self.total -= trailing
+        self.total_square -= trailing * trailing
+        return mean_square - mean * mean
+
+
+class StreamSTDDEV:
+
+    def __init__(self, timeperiod, nbdev=1.0):
+        self.nbdev = nbdev
+        self.variance = StreamVAR(timeperiod)
+
+    def update(self, value):
+        variance = self.variance.update(value)
+        if np.isnan(variance):
+            return np.nan
+        if variance <= 0.0:
+            return 0.0
+        return np.sqrt(variance) if self.nbdev == 1.0 else np.sqrt(variance) * self.nbdev
+
+
+class StreamMOM:
+
+    def __init__(self, timeperiod):
+        self.window = deque(maxlen=timeperiod + 1)
+
+    def update(self, value):
+        self.window.append(value)
+        return value - self.window[0] if len(self.window) == self.window.maxlen else np.nan
+
+
+class StreamROCR:
+
+    def __init__(self, timeperiod):
+        self.window = deque(maxlen=timeperiod + 1)
+
+    def update(self, value):
+        self.window.append(value)
+        if len(self.window) < self.window.maxlen:
+            return np.nan
+        return value / self.window[0] if self.window[0] != 0.0 else 0.0
+
+
+class StreamRSI:
+
+    def __init__(self, timeperiod, oscillator=False):
+        self.timeperiod = timeperiod
+        self.oscillator = oscillator
+        self.count = 0
+        self.previous = None
+        self.gain = 0.0
+        self.loss = 0.0
+
+    def update(self, value):
+        if self.previous is None:
+            self.previous = value
+            return np.nan
+        difference = value - self.previous
+        self.previous = value
+        self.count += 1
+        if self.count <= self.timeperiod:
+            if difference < 0:
+                self.loss -= difference
+            else:
+                self.gain += difference
+            if self.count < self.timeperiod:
+                return np.nan
+            self.gain /= self.timeperiod
+            self.loss /= self.timeperiod
+        else:
+            self.gain *= self.timeperiod - 1
+            self.loss *= self.timeperiod - 1
+            if difference < 0:
+                self.loss -= difference
+            else:
+                self.gain += difference
+            self.gain /= self.timeperiod
+            self.loss /= self.timeperiod
+        total = self.gain + self.loss
+        if total < 0.00000001:
+            return 0.0
+        return 100.0 * ((self.gain - self.loss) / total) if self.oscillator else 100.0 * (self.gain / total)
+
+
+class StreamATR:
+
+    def __init__(self, timeperiod):
+        self.timeperiod = timeperiod
+        self.count = 0
+        self.previous_close = None
+        self.total = 0.0
+        self.previous = np.nan
+
+    def update(self, high, low, close):
+        if self.previous_close is None:
+            self.previous_close = close
+            return np.nan
+        true_range = max(high, self.previous_close) - min(low, self.previous_close)
+        self.previous_close = close
+        self.count += 1
+        if self.count <= self.timeperiod:
+            self.total += true_range
+            if self.count < self.timeperiod:
+                return np.nan
+            self.previous = self.total / self.timeperiod
+            return self.previous
+        self.previous *= self.timeperiod - 1
+        self.previous += true_range
+        self.previous /= self.timeperiod
+        return self.previous
+
+
+class StreamTRIMA:
+
+    def __init__(self, timeperiod):
+        self.timeperiod = timeperiod
+        self.odd = timeperiod % 2 == 1
+        self.middle = (timeperiod >> 1) + 1 if self.odd else timeperiod >> 1
+        self.factor = 1.0 / (self.middle * self.middle) if self.odd else 1.0 / (self.middle * (self.middle + 1))
+        self.window = deque(maxlen=timeperiod + 1)
+        self.numerator = 0.0
+        self.numerator_sub = 0.0
+        self.numerator_add = 0.0
+
+    def update(self, value):
+        self.window.append(value)
+        if len(self.window) < self.timeperiod:
+            return np.nan
+        if len(self.window) == self.timeperiod:
+            for i in range(self.middle - 1, -1, -1):
+                self.numerator_sub += self.window[i]
+                self.numerator += self.numerator_sub
+            for i in range(self.middle, self.timeperiod):
+                self.numerator_add += self.window[i]
+                self.numerator += self.numerator_add
+            return self.numerator * self.factor
+        middle = self.window[self.middle]
+        self.numerator -= self.numerator_sub
+        self.numerator_sub -= self.window[0]
+        self.numerator_sub += middle
+        if self.odd:
+            self.numerator += self.numerator_add
+            self.numerator_add -= middle
+        else:
+            self.numerator_add -= middle
+            self.numerator += self.numerator_add
+        self.numerator_add += value
+        self.numerator += value
+        return self.numerator * self.factor
+
+
+class StreamKAMA:
+
+    def __init__(self, timeperiod):
+        self.timeperiod = timeperiod
+        self.slowest = 2.0 / (30.0 + 1.0)
+        self.difference = (2.0 / (2.0 + 1.0)) - self.slowest
+        self.window = deque(maxlen=timeperiod + 2)
+        self.total = 0.0
+        self.previous = np.nan
+
+    def update(self, value):
+        self.window.append(value)
+        if len(self.window) <= self.timeperiod:
+            return np.nan
+        if len(self.window) == self.timeperiod + 1:
+            for i in range(self.timeperiod):
+                self.total += abs(self.window[i] - self.window[i + 1])
+            self.previous = self.window[-2]
+            trailing = self.window[0]
+        else:
+            trailing = self.window[1]
+            self.total -= abs(self.window[0] - trailing)
+            self.total += abs(value - self.window[-2])
+        change = value - trailing
+        efficiency = 1.0 if self.total <= change or -0.00000001 < self.total < 0.00000001 else abs(change / self.total)
+        constant = (efficiency * self.difference) + self.slowest
+        constant *= constant
+        self.previous = ((value - self.previous) * constant) + self.previous
+        return self.previous
+
+
+class StreamSAR:
+
+    def __init__(self, acceleration, maximum):
+        self.acceleration = min(acceleration, maximum)
+        self.maximum = maximum
+        self.factor = self.acceleration
+        self.first = None
+        self.long = None
+        self.sar = None
+        self.extreme = None
+        self.high = None
+        self.low = None
+
+    def update(self, high, low):
+        if self.first is None:
+            self.first = (high, low)
+            return np.nan
+        if self.long is None:
+            first_high, first_low = self.first
+            difference_plus = high - first_high
+            difference_minus = first_low - low
+            self.long = not (difference_minus > 0 and difference_plus < difference_minus)
+            self.extreme, self.sar = (high, first_low) if self.long else (low, first_high)
+            self.high, self.low = high, low
+        previous_high, previous_low = self.high, self.low
+        self.high, self.low = high, low
+        if self.long:
+            if low <= self.sar:
+                self.long = False
+                output = max(self.extreme, previous_high, high)
+                self.factor = self.acceleration
+                self.extreme = low
+                self.sar = max(output + self.factor * (self.extreme - output), previous_high, high)
+                return output
+            output = self.sar
+            if high > self.extreme:
+                self.extreme = high
+                self.factor = min(self.factor + self.acceleration, self.maximum)
+            self.sar = min(self.sar + self.factor * (self.extreme - self.sar), previous_low, low)
+            return output
+        if high >= self.sar:
+            self.long = True
+            output = min(self.extreme, previous_low, low)
+            self.factor = self.acceleration
+            self.extreme = high
+            self.sar = min(output + self.factor * (self.extreme - output), previous_low, low)
+            return output
+        output = self.sar
+        if low < self.extreme:
+            self.extreme = low
+            self.factor = min(self.factor + self.acceleration, self.maximum)
+        self.sar = max(self.sar + self.factor * (self.extreme - self.sar), previous_high, high)
+        return output
+
+
+class StreamMovement:
+
+    def __init__(self, timeperiod):
+        self.timeperiod = timeperiod
+        self.count = 0
+        self.previous_high = None
+        self.previous_low = None
+        self.previous_close = None
+        self.minus_dm = 0.0
+        self.plus_dm = 0.0
+        self.true_range = 0.0
+
+    def update(self, high, low, close):
+        if self.previous_close is None:
+            self.previous_high, self.previous_low, self.previous_close = high, low, close
+            return False
+        difference_plus = high - self.previous_high
+        difference_minus = self.previous_low - low
+        true_range = max(high, self.previous_close) - min(low, self.previous_close)
+        self.previous_high, self.previous_low, self.previous_close = high, low, close
+        self.count += 1
+        if self.count >= self.timeperiod:
+            self.minus_dm -= self.minus_dm / self.timeperiod
+            self.plus_dm -= self.plus_dm / self.timeperiod
+        if difference_minus > 0 and difference_plus < difference_minus:
+            self.minus_dm += difference_minus
+        elif difference_plus > 0 and difference_plus > difference_minus:
+            self.plus_dm += difference_plus
+        if self.count < self.timeperiod:
+            self.true_range += true_range
+            return False
+        self.true_range = self.true_range - (self.true_range / self.timeperiod) + true_range
+        return True
+
+    def index(self):
+        if -0.00000001 < self.true_range < 0.00000001:
+            return None
+        minus_di = 100.0 * (self.minus_dm / self.true_range)
+        plus_di = 100.0 * (self.plus_dm / self.true_range)
+        total = minus_di + plus_di
+        if -0.00000001 < total < 0.00000001:
+            return None
+        return 100.0 * (abs(minus_di - plus_di) / total)
+
+
+class StreamDX:
+
+    def __init__(self, timeperiod):
+        self.movement = StreamMovement(timeperiod)
+        self.previous = 0.0
+
+    def update(self, high, low, close):
+        if not self.movement.update(high, low, close):
+            return np.nan
+        dx = self.movement.index()
+        self.previous = dx if dx is not None else self.previous
+        return self.previous
+
+
+class StreamADX:
+
+    def __init__(self, timeperiod):
+        self.timeperiod = timeperiod
+        self.movement = StreamMovement(timeperiod)
+        self.count = 0
+        self.total = 0.0
+        self.previous = np.nan
+
+    def update(self, high, low, close):
+        if not self.movement.update(high, low, close):
+            return np.nan
+        dx = self.movement.index()
+        self.count += 1
+        if self.count <= self.timeperiod:
+            self.total += dx if dx is not None else 0.0
+            if self.count < self.timeperiod:
+                return np.nan
+            self.previous = self.total / self.timeperiod
+        elif dx is not None:
+            self.previous = ((self.previous * (self.timeperiod - 1)) + dx) / self.timeperiod
+        return self.previous
+
+
+class StreamADXR:
+
+    def __init__(self, timeperiod):
+        self.adx = StreamADX(timeperiod)
+        self.window = deque(maxlen=timeperiod)
+
+    def update(self, high, low, close):
+        adx = self.adx.update(high, low, close)
+        if np.isnan(adx):
+            return np.nan
+        self.window.append(adx)
+        return (adx + self.window[0]) / 2.0 if len(self.window) == self.window.maxlen else np.nan
+
+
+class StreamSTOCHRSIOSC:
+
+    def __init__(self, timeperiod, fastk_period, fastd_period):
+        self.rsi = StreamRSI(timeperiod)
+        self.window = deque(maxlen=fastk_period)
+        self.fastd = StreamSMA(fastd_period)
+
+    def update(self, value):
+        rsi = self.rsi.update(value)
+        if np.isnan(rsi):
+            return np.nan
+        self.window.append(rsi)
+        if len(self.window) < self.window.maxlen:
+            return np.nan
+        lowest = min(self.window)
+        difference = (max(self.window) - lowest) / 100.0
+        fastk = (rsi - lowest) / difference if difference != 0.0 else 0.0
+        return fastk - self.fastd.update(fastk)
+
+
+class StreamFastK:
+
+    def __init__(self, fastk_period):
+        self.highs = deque(maxlen=fastk_period)
+        self.lows = deque(maxlen=fastk_period)
+
+    def update(self, high, low, close):
+        self.highs.append(high)
+        self.lows.append(low)
+        if len(self.lows) < self.lows.maxlen:
+            return np.nan
+        lowest = min(self.lows)
+        difference = (max(self.highs) - lowest) / 100.0
+        return (close - lowest) / difference if difference != 0.0 else 0.0
+
+
+class StreamSTOCHOSC:
+
+    def __init__(self, fastk_period, slowk_period, slowd_period):
+        self.fastk = StreamFastK(fastk_period)
+        self.slowk = StreamSMA(slowk_period)
+        self.slowd = StreamSMA(slowd_period)
+
+    def update(self, high, low, close):
+        fastk = self.fastk.update(high, low, close)
+        if np.isnan(fastk):
+            return np.nan
+        slowk = self.slowk.update(fastk)
+        if np.isnan(slowk):
+            return np.nan
+        return slowk - self.slowd.update(slowk)
+
+
+class StreamSTOCHFOSC:
+
+    def __init__(self, fastk_period, fastd_period):
+        self.fastk = StreamFastK(fastk_period)
+        self.fastd = StreamSMA(fastd_period)
+
+    def update(self, high, low, close):
+        fastk = self.fastk.update(high, low, close)
+        if np.isnan(fastk):
+            return np.nan
+        return fastk - self.fastd.update(fastk)
+
+
+class StreamWILLR:
+
+    def __init__(self, timeperiod):
+        self.highs = deque(maxlen=timeperiod)
+        self.lows = deque(maxlen=timeperiod)
+
+    def update(self, high, low, close):
+        self.highs.append(high)
+        self.lows.append(low)
+        if len(self.lows) < self.lows.maxlen:
+            return np.nan
+        highest = max(self.highs)
+        difference = (highest - min(self.lows)) / 100.0
+        return (close - highest) / difference if difference != 0.0 else 0.0
+
+
+class StreamAROONOSC:
+
+    def __init__(self, timeperiod):
+        self.factor = 100.0 / timeperiod
+        self.highs = deque(maxlen=timeperiod + 1)
+        self.lows = deque(maxlen=timeperiod + 1)
+
+    def update(self, high, low):
+        self.highs.append(high)
+        self.lows.append(low)
+        if len(self.lows) < self.lows.maxlen:
+            return np.nan
+        highest_index = lowest_index = 0
+        highest, lowest = self.highs[0], self.lows[0]
+        for i in range(1, len(self.lows)):
+            if self.highs[i] >= highest:
+                highest, highest_index = self.highs[i], i
+            if self.lows[i] <= lowest:
+                lowest, lowest_index = self.lows[i], i
+        return self.factor * (highest_index - lowest_index)
+
+
+class StreamCCI:
+
+    def __init__(self, timeperiod):
+        self.timeperiod = timeperiod
+        self.circular = [0.0] * timeperiod
+        self.count = 0
+
+    def update(self, high, low, close):
+        value = (high + low + close) / 3
+        self.circular[self.count % self.timeperiod] = value
+        self.count += 1
+        if self.count < self.timeperiod:
+            return np.nan
+        average = 0.0
+        for typical in self.circular:
+            average += typical
+        average /= self.timeperiod
+        deviation = 0.0
+        for typical in self.circular:
+            deviation += abs(typical - average)
+        difference = value - average
+        if difference != 0.0 and deviation != 0.0:
+            return difference / (0.015 * (deviation / self.timeperiod))
+        return 0.0
+
+
+class StreamMFI:
+
+    def __init__(self, timeperiod):
+        self.timeperiod = timeperiod
+        self.flows = deque(maxlen=timeperiod)
+        self.previous = None
+        self.positive = 0.0
+        self.negative = 0.0
+
+    def update(self, high, low, close, volume):
+        typical = (high + low + close) / 3.0
+        if self.previous is None:
+            self.previous = typical
+            return np.nan
+        difference = typical - self.previous
+        self.previous = typical
+        flow = typical * volume
+        if len(self.flows) == self.timeperiod:
+            positive, negative = self.flows[0]
+            self.positive -= positive
+            self.negative -= negative
+        positive, negative = (flow, 0.0) if difference > 0 else (0.0, flow) if difference < 0 else (0.0, 0.0)
+        self.positive += positive
+        self.negative += negative
+        self.flows.append((positive, negative))
+        if len(self.flows) < self.timeperiod:
+            return np.nan
+        total = self.positive + self.negative
+        return 100.0 * (self.positive / total) if total >= 1.0 else 0.0
+
+
+class StreamBBOSC:
+
+    def __init__(self, timeperiod, nbdevup, nbdevdn):
+        self.timeperiod = timeperiod
+        self.nbdevup = nbdevup
+        self.nbdevdn = nbdevdn
+        self.middle = StreamSMA(timeperiod)
+        self.window = deque(maxlen=timeperiod)
+        self.total_square = 0.0
+
+    def update(self, value):
+        middle = self.middle.update(value)
+        self.window.append(value)
+        self.total_square += value * value
+        if np.isnan(middle):
+            return np.nan
+        variance = self.total_square / self.timeperiod
+        trailing = self.window[0]
+        self.total_square -= trailing * trailing
+        variance -= middle * middle
+        deviation = np.sqrt(variance) if variance >= 0.00000000000001 else 0.0
+        return ((middle + deviation * self.nbdevup) - (middle - deviation * self.nbdevdn)) / middle
+
+
+class StreamMACDOSC:
+
+    def __init__(self, fastperiod, slowperiod, signalperiod):
+        fastperiod, slowperiod = min(fastperiod, slowperiod), max(fastperiod, slowperiod)
+        self.skip = slowperiod - fastperiod
+        self.count = 0
+        self.fast = StreamEMA(fastperiod)
+        self.slow = StreamEMA(slowperiod)
+        self.signal = StreamEMA(signalperiod)
+
+    def update(self, value):
+        # talib seeds the fast EMA on the bars that end the slow EMA's seed, not on the first bars
+        self.count += 1
+        slow = self.slow.update(value)
+        fast = self.fast.update(value) if self.count > self.skip else np.nan
+        if np.isnan(slow):
+            return np.nan
+        macd = fast - slow
+        return macd - self.signal.update(macd)
+
+
+class StreamTRIX:
+
+    def __init__(self, timeperiod):
+        self.first = StreamEMA(timeperiod)
+        self.second = StreamEMA(timeperiod)
+        self.third = StreamEMA(timeperiod)
+        self.previous = np.nan
+
+    def update(self, value):
+        first = self.first.update(value)
+        if np.isnan(first):
+            return np.nan
+        second = self.second.update(first)
+        if np.isnan(second):
+            return np.nan
+        third = self.third.update(second)
+        previous, self.previous = self.previous, third
+        if np.isnan(previous):
+            return np.nan
+        return ((third / previous) - 1.0) * 100.0 if previous != 0.0 else 0.0
+
+
+class StreamTSF:
+
+    def __init__(self, timeperiod):
+        self.timeperiod = timeperiod
+        self.sum_x = timeperiod * (timeperiod - 1) * 0.5
+        self.divisor = self.sum_x * self.sum_x - timeperiod * (timeperiod * (timeperiod - 1) * (timeperiod * 2 - 1) // 6)
+        self.window = deque(maxlen=timeperiod)
+
+    def update(self, value):
+        self.window.append(value)
+        if len(self.window) < self.timeperiod:
+            return np.nan
+        sum_xy = 0.0
+        sum_y = 0.0
+        for i, y in zip(range(self.timeperiod - 1, -1, -1), self.window):
+            sum_y += y
+            sum_xy += float(i) * y
+        m = (self.timeperiod * sum_xy - self.sum_x * sum_y) / self.divisor
+        b = (sum_y - m * self.sum_x) / self.timeperiod
+        return b + m * self.timeperiod
+
+
+class StreamULTOSC:
+
+    def __init__(self, timeperiod1, timeperiod2, timeperiod3):
+        self.periods = sorted((timeperiod1, timeperiod2, timeperiod3))
+        self.lookback = self.periods[-1]
+        self.terms = deque(maxlen=self.lookback)
+        self.totals = [[0.0, 0.0] for _ in self.periods]
+        self.previous_close = None
+        self.count = 0
+
+    def update(self, high, low, close):
+        if self.previous_close is None:
+            self.previous_close = close
+            return np.nan
+        true_low = min(low, self.previous_close)
+        true_range = max(high - low, abs(self.previous_close - high), abs(self.previous_close - low))
+        term = (close - true_low, true_range)
+        self.previous_close = close
+        self.count += 1
+        self.terms.append(term)
+        if self.count < self.lookback:
+            for period, total in zip(self.periods, self.totals):
+                if self.count > self.lookback - period:
+                    total[0] += term[0]
+                    total[1] += term[1]
+            return np.nan
+        output = 0.0
+        for weight, total in zip((4.0, 2.0, 1.0), self.totals):
+            total[0] += term[0]
+            total[1] += term[1]
+            if not -0.00000000000001 < total[1] < 0.00000000000001:
+                output += weight * (total[0] / total[1])
+        for period, total in zip(self.periods, self.totals):
+            trailing = self.terms[-period]
+            total[0] -= trailing[0]
+            total[1] -= trailing[1]
+        return 100.0 * (output / 7.0)
+
+
+class StreamAD:
+
+    def __init__(self):
+        self.ad = 0.0
+
+    def update(self, high, low, close, volume):
+        spread = high - low
+        if spread > 0.0:
+            self.ad += (((close - low) - (high - close)) / spread) * volume
+        return self.ad
+
+
+class StreamADOSC:
+
+    def __init__(self, fastperiod, slowperiod):
+        self.ad = StreamAD()
+        self.fast_k = 2.0 / (fastperiod + 1)
+        self.slow_k = 2.0 / (slowperiod + 1)
+        self.lookback = max(fastperiod, slowperiod) - 1
+        self.count = 0
+        self.fast = None
+        self.slow = None
+
+    def update(self, high, low, close, volume):
+        ad = self.ad.update(high, low, close, volume)
+        if self.fast is None:
+            self.fast = self.slow = ad
+        else:
+            self.fast = (self.fast_k * ad) + ((1.0 - self.fast_k) * self.fast)
+            self.slow = (self.slow_k * ad) + ((1.0 - self.slow_k) * self.slow)
+        self.count += 1
+        return self.fast - self.slow if self.count > self.lookback else np.nan
+
+
+class StreamOBV:
+
+    def __init__(self):
+        self.obv = None
+        self.previous = None
+
+    def update(self, close, volume):
+        if self.obv is None:
+            self.obv = volume
+        elif close > self.previous:
+            self.obv += volume
+        elif close < self.previous:
+            self.obv -= volume
+        self.previous = close
+        return self.obv
+
+
+class StreamLog:
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def update(self, value):
+        return np.log(self.stream.update(value))
+
+
+class StreamDifference:
+
+    def __init__(self, fast, slow):
+        self.fast = fast
+        self.slow = slow
+
+    def update(self, value):
+        return self.fast.update(value) - self.slow.update(value)
+
+
+class StreamBars:
+    __slots__ = ("Open", "High", "Low", "Close", "Volume")
+
+    def __init__(self, open_prices, high_prices, low_prices, close_prices, volumes):
+        self.Open = open_prices
+        self.High = high_prices
+        self.Low = low_prices
+        self.Close = close_prices
+        self.Volume = volumes
+
+
+class StreamWindow:
+    """Fallback for custom indicators without a kernel in Streams: re-runs talib over the last lookback + 1 bars.
+
+    Every built-in indicator except MAMA and FAMA has an exact kernel. Those two carry unbounded Hilbert transform
+    state, have no kernel, and are rejected by StreamTechnical.create. Windows cost O(lookback) per bar and may
+    differ from offline_technical in the last bits when the indicator keeps running sums.
+    """
+
+    def __init__(self, indicator, probe_size=4096):
+        self.indicator = indicator
+        self.size = self.lookback(indicator, self.probe_bars(probe_size)) + 1
+        self.buffer = np.zeros((5, 2 * self.size))
+        self.count = 0
+
+    @staticmethod
+    def probe_bars(probe_size):
+        steps = np.arange(probe_size, dtype=float)
+        close_prices = 1.0 + 0.01 * np.sin(steps / 7.0) + 0.0001 * steps
+        open_prices = np.concatenate(([close_prices[0]], close_prices[:-1]))
+        return open_prices, np.maximum(open_prices, close_prices) + 0.001, np.minimum(open_prices, close_prices) - 0.001, close_prices, 1000.0 + steps % 7
+
+    @staticmethod
+    def lookback(indicator, probe):
+        valid = np.flatnonzero(~np.isnan(np.asarray(indicator(talib, StreamBars(*probe)), dtype=float)))
+        return int(valid[0]) if len(valid) else len(probe[0]) - 1
+
+    @staticmethod
+    def bounded(indicator, probe_size=4096, checks=64):
+        probe = StreamWindow.probe_bars(probe_size)
+        output = np.asarray(indicator(talib, StreamBars(*probe)), dtype=float)
+        size = StreamWindow.lookback(indicator, probe) + 1
+        if size + checks > probe_size:
+            return False
+        tolerance = 1e-9 * np.nanmax(np.abs(output))
+        for end in range(probe_size - checks, probe_size):
+            window = np.asarray(indicator(talib, StreamBars(*(column[end - size + 1:end + 1] for column in probe))), dtype=float)
+            if not np.isclose(window[-1], output[end], rtol=0.0, atol=tolerance, equal_nan=True):
+                return False
+        return True
+
+    def __getstate__(self):
+        return {**self.__dict__, "indicator": None}
+
+    def __call__(self, open_price, high_price, low_price, close_price, volume):
+        index = self.count % self.size
+        self.buffer[:, index] = self.buffer[:, index + self.size] = (open_price, high_price, low_price, close_price, volume)
+        self.count += 1
+        start = self.count % self.size if self.count >= self.size else self.size
+        window = self.buffer[:, start:start + min(self.count, self.size)]
+        return float(np.asarray(self.indicator(talib, StreamBars(*window)), dtype=float)[-1])
+
+
+def update_close(stream, open_price, high_price, low_price, close_price, volume):
+    return stream.update(close_price)
+
+
+def update_high_low_close(stream, open_price, high_price, low_price, close_price, volume):
+    return stream.update(high_price, low_price, close_price)
+
+
+def update_high_low_close_volume(stream, open_price, high_price, low_price, close_price, volume):
+    return stream.update(high_price, low_price, close_price, volume)
+
+
+def update_high_low(stream, open_price, high_price, low_price, close_price, volume):
+    return stream.update(high_price, low_price)
+
+
+def update_close_volume(stream, open_price, high_price, low_price, close_price, volume):
+    return stream.update(close_price, volume)
+
+
+def on_close(stream):
+    return functools.partial(update_close, stream)
+
+
+def on_high_low_close(stream):
+    return functools.partial(update_high_low_close, stream)
+
+
+def on_high_low_close_volume(stream):
+    return functools.partial(update_high_low_close_volume, stream)
+
+
+def on_high_low(stream):
+    return functools.partial(update_high_low, stream)
+
+
+def on_close_volume(stream):
+    return functools.partial(update_close_volume, stream)
+
+
+def stream_avgprice(open_price, high_price, low_price, close_price, volume):
+    return (high_price + low_price + close_price + open_price) / 4
+
+
+def stream_medprice(open_price, high_price, low_price, close_price, volume):
+    return (high_price + low_price) / 2
+
+
+def stream_typprice(open_price, high_price, low_price, close_price, volume):
+    return (high_price + low_price + close_price) / 3
+
+
+def stream_wclprice(open_price, high_price, low_price, close_price, volume):
+    return (high_price + low_price + (close_price * 2)) / 4
+
+
+def stream_bop(open_price, high_price, low_price, close_price, volume):
+    spread = high_price - low_price
+    return (close_price - open_price) / spread if spread > 0.0 else 0.0
+
+
+Streams = {
+    # ------ General Indicators ------
+    "AVGPRICE": lambda: stream_avgprice,
+    "MEDPRICE": lambda: stream_medprice,
+    "TYPPRICE": lambda: stream_typprice,
+    "WCLPRICE": lambda: stream_wclprice,
+    "DIFF": lambda: on_close(StreamMOM(1)),
+    "RET": lambda: on_close(StreamROCR(1)),
+    "LOGRET": lambda: on_close(StreamLog(StreamROCR(1))),
+
+    # ------ Trend Indicators ------
+    "SMA10": lambda: on_close(StreamSMA(10)),
+    "SMA20": lambda: on_close(StreamSMA(20)),
+    "SMA50": lambda: on_close(StreamSMA(50)),
+    "SMA100": lambda: on_close(StreamSMA(100)),
+
+    "EMA10": lambda: on_close(StreamEMA(10)),
+    "EMA20": lambda: on_close(StreamEMA(20)),
+    "EMA50": lambda: on_close(StreamEMA(50)),
+    "EMA100": lambda: on_close(StreamEMA(100)),
+
+    "DEMA10": lambda: on_close(StreamDEMA(10)),
+    "DEMA20": lambda: on_close(StreamDEMA(20)),
+    "DEMA50": lambda: on_close(StreamDEMA(50)),
+    "DEMA100": lambda: on_close(StreamDEMA(100)),
+
+    "TEMA10": lambda: on_close(StreamTEMA(10)),
+    "TEMA20": lambda: on_close(StreamTEMA(20)),
+    "TEMA50": lambda: on_close(StreamTEMA(50)),
+    "TEMA100": lambda: on_close(StreamTEMA(100)),
+
+    "WMA10": lambda: on_close(StreamWMA(10)),
+    "WMA20": lambda: on_close(StreamWMA(20)),
+    "WMA50": lambda: on_close(StreamWMA(50)),
+    "WMA100": lambda: on_close(StreamWMA(100)),
+
+    "TRIMA10": lambda: on_close(StreamTRIMA(10)),
+    "TRIMA20": lambda: on_close(StreamTRIMA(20)),
+    "TRIMA50": lambda: on_close(StreamTRIMA(50)),
+    "TRIMA100": lambda: on_close(StreamTRIMA(100)),
+
+    "KAMA10": lambda: on_close(StreamKAMA(10)),
+    "KAMA20": lambda: on_close(StreamKAMA(20)),
+    "KAMA50": lambda: on_close(StreamKAMA(50)),
+    "KAMA100": lambda: on_close(StreamKAMA(100)),
+
+    # ------ Momentum Indicators ------
+    "DX": lambda: on_high_low_close(StreamDX(14)),
+    "ADX": lambda: on_high_low_close(StreamADX(14)),
+    "ADXR": lambda: on_high_low_close(StreamADXR(14)),
+    "APO": lambda: on_close(StreamDifference(StreamSMA(12), StreamSMA(26))),
+    "AROONOSC": lambda: on_high_low(StreamAROONOSC(25)),
+    "BBOSC": lambda: on_close(StreamBBOSC(20, nbdevup=2, nbdevdn=2)),
+    "BOP": lambda: stream_bop,
+    "CCI": lambda: on_high_low_close(StreamCCI(20)),
+    "CMO": lambda: on_close(StreamRSI(14, oscillator=True)),
+    "MACDOSC": lambda: on_close(StreamMACDOSC(fastperiod=12, slowperiod=26, signalperiod=9)),
+    "MFI": lambda: on_high_low_close_volume(StreamMFI(14)),
+    "MOM": lambda: on_close(StreamMOM(10)),
+    "SAR": lambda: on_high_low(StreamSAR(acceleration=0.02, maximum=0.2)),
+    "RSI": lambda: on_close(StreamRSI(14)),
+    "STOCHRSIOSC": lambda: on_close(StreamSTOCHRSIOSC(14, fastk_period=5, fastd_period=3)),
+    "STOCHOSC": lambda: on_high_low_close(StreamSTOCHOSC(fastk_period=5, slowk_period=3, slowd_period=3)),
+    "STOCHFOSC": lambda: on_high_low_close(StreamSTOCHFOSC(fastk_period=5, fastd_period=3)),
+    "TRIX": lambda: on_close(StreamTRIX(30)),
+    "TSF": lambda: on_close(StreamTSF(14)),
+    "ULTOSC": lambda: on_high_low_close(StreamULTOSC(timeperiod1=7, timeperiod2=14, timeperiod3=28)),
+    "WILLR": lambda: on_high_low_close(StreamWILLR(14)),
+
+    # ------ Volume Indicators ------
+    "AD": lambda: on_high_low_close_volume(StreamAD()),
+    "ADOSC": lambda: on_high_low_close_volume(StreamADOSC(fastperiod=3, slowperiod=10)),
+    "OBV": lambda: on_close_volume(StreamOBV()),
+
+    # ------ Volatility Indicators ------
+    "ATR": lambda: on_high_low_close(StreamATR(14)),
+    "STDDEV": lambda: on_close(StreamSTDDEV(5, nbdev=1)),
+    "VAR": lambda: on_close(StreamVAR(5, nbdev=1)),
+}
+
+
+class StreamTechnical:
+
+    def __init__(self, indicators):
+        self.names = list(indicators.keys())
+        self.indicators = list(indicators.values())
+        self.streams = [self.create(name, indicator) for name, indicator in indicators.items()]
+
+    @staticmethod
+    def create(name, indicator):
+        if name in Streams and indicator is Indicators.get(name):
+            return Streams[name]()
+        if not StreamWindow.bounded(indicator):
+            raise ValueError(f"Indicator {name} depends on its whole history and has no streaming kernel, compute it with offline_technical")
+        return StreamWindow(indicator)
+
+    def warm(self, market_data):
+        indicator_data = np.full((len(market_data), len(self.streams)), np.nan)
+        bars = zip(*(market_data[column].to_numpy(dtype=float) for column in ("Open", "High", "Low", "Close", "Volume")))
+        for i, bar in enumerate(bars):
+            indicator_data[i] = self.update(*bar)
+        return pd.DataFrame(indicator_data, index=market_data.index, columns=self.names)
+
+    def update(self, open_price, high_price, low_price, close_price, volume):
+        volume = float(volume)
+        return [stream(open_price, high_price, low_price, close_price, volume) for stream in self.streams]
+
+    def state(self):
+        return np.frombuffer(pickle.dumps(self.streams), dtype=np.uint8)
+
+    def restore(self, state):
+        streams = pickle.loads(state.tobytes())
+        for stream, indicator in zip(streams, self.indicators):
+            if isinstance(stream, StreamWindow):
+                stream.indicator = indicator
+        self.streams = streams
@@ -1,23 +1,36 @@
+import time
 import argparse
+import threading
+import numpy as np
 import pandas as pd
 
+from concurrent.futures import ThreadPoolExecutor
+
 from Utility.Logger import Logger
 from Database.Database import Database
+from Strategy.Api import BarRecord, IdReceive
 from Strategy.Machine import Machine
-from Strategy.Strategy import Strategy
+from Strategy.Strategy import Strategy, Offloaded
+from Strategy.Transport import create_transport
 
 
 class Downloader(Strategy):
 
-    def __init__(self, db, iid, symbol, timeframe, logger):
-        super().__init__(iid, symbol, timeframe, logger)
+    offloaded = Offloaded | {IdReceive.Bar.value}
+
+    def __init__(self, db, iid, symbol, timeframe, logger, transport=None, chunk_size=4096, flush_seconds=60.0):
+        super().__init__(iid, symbol, timeframe, logger, transport)
         self.db = db
-        self.raw_dates = []
-        self.raw_open_prices = []
-        self.raw_high_prices = []
-        self.raw_low_prices = []
-        self.raw_close_prices = []
-        self.raw_volumes = []
+        self.chunk_size = chunk_size
+        self.flush_seconds = flush_seconds
+        self.chunk = np.empty(chunk_size, dtype=BarRecord)
+        self.count = 0
+        self.flushed_time = time.monotonic()
+        self.writer = None
+        self.pending = None
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.timer = None
 
     def create_signal_management(self):
         machine = Machine("Main", self.symbol, self.timeframe, self.logger)
@@ -27,25 +40,88 @@ class Downloader(Strategy):
         state2 = machine.create_state(name="End", end=True)
 
         state0.on_bar(action=self.append_data, to=state0, reason=None)
+        state0.on_bars(action=self.append_bars, to=state0, reason=None)
         state0.on_complete(action=None, to=state1, reason="Complete")
         state0.on_shutdown(action=self.save_data, to=state2, reason="Error")
 
         state1.on_bar(action=self.append_data, to=state1, reason=None)
+        state1.on_bars(action=self.append_bars, to=state1, reason=None)
         state1.on_shutdown(action=self.save_data, to=state2, reason="Terminated")
 
         return machine
 
     def append_data(self, date, open_price, high_price, low_price, close_price, volume):
-        self.raw_dates.append(date)
-        self.raw_open_prices.append(open_price)
-        self.raw_high_prices.append(high_price)
-        self.raw_low_prices.append(low_price)
-        self.raw_close_prices.append(close_price)
-        self.raw_volumes.append(volume)
+        self.start_timer()
+        with self.lock:
+            self.wait_pending()
+            self.chunk[self.count] = (date, open_price, high_price, low_price, close_price, volume)
+            self.count += 1
+            if self.count == self.chunk_size:
+                self.flush_chunk()
+
+    def append_bars(self, dates, open_prices, high_prices, low_prices, close_prices, volumes):
+        columns = (dates, open_prices, high_prices, low_prices, close_prices, volumes)
+        offset = 0
+        self.start_timer()
+        while offset < len(dates):
+            with self.lock:
+                self.wait_pending()
+                size = min(self.chunk_size - self.count, len(dates) - offset)
+                target = self.chunk[self.count:self.count + size]
+                for name, column in zip(BarRecord.names, columns):
+                    target[name] = column[offset:offset + size]
+                self.count += size
+                offset += size
+                if self.count == self.chunk_size:
+                    self.flush_chunk()
+
+    def start_timer(self):
+        if self.timer is None:
+            self.timer = threading.Thread(target=self.flush_periodically, name=f"Downloader {self.symbol} {self.timeframe} Timer", daemon=True)
+            self.timer.start()
+
+    def wait_pending(self):
+        if self.pending is not None:
+            self.pending.result()
+            self.pending = None
+
+    def flush_periodically(self):
+        while not self.stopped.wait(max(self.flushed_time + self.flush_seconds - time.monotonic(), 0.0)):
+            with self.lock:
+                if time.monotonic() - self.flushed_time >= self.flush_seconds:
+                    self.flush_chunk()
+
+    def flush_chunk(self):
+        self.flushed_time = time.monotonic()
+        if not self.count:
+            return
+        if self.writer is None:
+            self.writer = ThreadPoolExecutor(1, thread_name_prefix=f"Downloader {self.symbol} {self.timeframe}")
+        if self.pending is not None:
+            self.pending.result()
+        self.pending = self.writer.submit(self.write_chunk, self.chunk[:self.count])
+        self.chunk = np.empty(self.chunk_size, dtype=BarRecord)
+        self.count = 0
+
+    def write_chunk(self, records):
+        index = pd.DatetimeIndex(records["Date"].view("datetime64[ms]"), name="Date").tz_localize("UTC")
+        self.db.save_data(pd.DataFrame({column: records[column] for column in BarRecord.names[1:]}, index=index))
+
+    def last_date(self):
+        return self.db.last_date()
 
     def save_data(self):
-        raw_data = {"Date": self.raw_dates, "Open": self.raw_open_prices, "High": self.raw_high_prices, "Low": self.raw_low_prices, "Close": self.raw_close_prices, "Volume": self.raw_volumes}
-        self.db.save_data(pd.DataFrame(raw_data).set_index("Date"))
+        self.stopped.set()
+        if self.timer is not None:
+            self.timer.join()
+        self.flush_chunk()
+        if self.pending is not None:
+            self.pending.result()
+            self.pending = None
+        if self.writer is None:
+            return
+        self.writer.shutdown()
+        self.writer = None
         self.db.clean_data()
 
 
@@ -55,6 +131,7 @@ def main():
     parser.add_argument("--symbol", type=str, help="Symbol in which the robot will operate", required=True)
     parser.add_argument("--timeframe", type=str, help="Timeframe in which the robot will operate", required=True)
     parser.add_argument("--verbose", type=str, help="Logging verbose level", required=True)
+    parser.add_argument("--transport", type=str, help="Transport used to reach the robot", default=None, choices=["Pipe", "Socket"])
     args = parser.parse_args()
 
     iid = args.iid
@@ -62,9 +139,10 @@ def main():
     timeframe = args.timeframe.capitalize()
     verbose = args.verbose.upper()
     logger = Logger(verbose)
+    transport = create_transport(args.transport, iid, symbol, timeframe)
 
     db = Database("OHLCV", symbol, timeframe, logger)
-    strategy = Downloader(db, iid, symbol, timeframe, logger)
+    strategy = Downloader(db, iid, symbol, timeframe, logger, transport)
     strategy.run()
 
 
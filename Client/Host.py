@@ -0,0 +1,61 @@
+import asyncio
+import argparse
+
+from concurrent.futures import ThreadPoolExecutor
+
+from Utility.Logger import Logger
+from Database.Database import Database
+from Strategy.Transport import create_transport
+from Downloader import Downloader
+from NNFX import NNFX
+
+Strategies = {"Downloader": Downloader, "NNFX": NNFX}
+
+
+class Host:
+
+    def __init__(self, strategies, logger, workers=1):
+        self.strategies = strategies
+        self.logger = logger
+        self.workers = workers
+
+    async def gather(self):
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="Host") as executor:
+            results = await asyncio.gather(*(strategy.serve(executor) for strategy in self.strategies), return_exceptions=True)
+        for strategy, result in zip(self.strategies, results):
+            if isinstance(result, BaseException):
+                self.logger.error(f"Host {strategy.symbol} {strategy.timeframe} {strategy.iid}: {type(result).__name__} {result}")
+        return results
+
+    def run(self):
+        self.logger.info(f"Host: [Instances: {len(self.strategies)} | Workers: {self.workers}]")
+        return asyncio.run(self.gather())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--instance", type=str, nargs=4, action="append", help="Strategy, InstanceId, symbol and timeframe of a robot", metavar=("STRATEGY", "IID", "SYMBOL", "TIMEFRAME"), required=True)
+    parser.add_argument("--verbose", type=str, help="Logging verbose level", required=True)
+    parser.add_argument("--transport", type=str, help="Transport used to reach the robots", default=None, choices=["Pipe", "Socket"])
+    parser.add_argument("--workers", type=int, help="Threads running database and indicator work", default=1)
+    args = parser.parse_args()
+
+    verbose = args.verbose.upper()
+    logger = Logger(verbose)
+
+    strategies = []
+    for name, iid, symbol, timeframe in args.instance:
+        if name not in Strategies:
+            parser.error(f"Unknown strategy {name}, choose from {', '.join(Strategies)}")
+        symbol = symbol.upper()
+        timeframe = timeframe.capitalize()
+        instance_logger = Logger(verbose, name=f"{name} {symbol} {timeframe} {iid}")
+        transport = create_transport(args.transport, iid, symbol, timeframe)
+        db = Database("OHLCV", symbol, timeframe, instance_logger)
+        strategies.append(Strategies[name](db, iid, symbol, timeframe, instance_logger, transport))
+
+    Host(strategies, logger, args.workers).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import os
+import glob
+import argparse
+
+from Utility.Logger import Logger
+from Database.Database import Database
+from Database.Parquet import ParquetDatabase
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbol", type=str, help="Symbol to migrate, all symbols when omitted", default=None)
+    parser.add_argument("--timeframe", type=str, help="Timeframe to migrate, all timeframes when omitted", default=None)
+    parser.add_argument("--verbose", type=str, help="Logging verbose level", default="Info", choices=["Error", "Warning", "Info", "Debug"])
+    parser.add_argument("--root", type=str, help="Data folder holding the HDF5 files", default=None)
+    args = parser.parse_args()
+
+    logger = Logger(args.verbose.upper())
+    root = args.root if args.root is not None else os.path.join(os.path.dirname(os.path.abspath(__file__)), "Database", "Data")
+    symbol = args.symbol.upper() if args.symbol else "*"
+    timeframe = args.timeframe.capitalize() if args.timeframe else "*"
+
+    for file_path in sorted(glob.glob(os.path.join(root, symbol, timeframe, "*.h5"))):
+        folder_path, file_name = os.path.split(file_path)
+        folder_path, file_timeframe = os.path.split(folder_path)
+        file_symbol = os.path.basename(folder_path)
+        name = os.path.splitext(file_name)[0]
+        source = Database(name, file_symbol, file_timeframe, logger, root=root)
+        target = ParquetDatabase(name, file_symbol, file_timeframe, logger, root=root)
+        target.save_data(source.load_data())
+        target.clean_data()
+
+
+if __name__ == "__main__":
+    main()
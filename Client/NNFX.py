@@ -1,17 +1,24 @@
+import os
 import argparse
+import numpy as np
 import pandas as pd
 
+from concurrent.futures import ThreadPoolExecutor
+
 from Utility.Logger import Logger
 from Database.Database import Database
-from Database.Technical import offline_technical, online_technical
+from Database.Features import FeatureStore
+from Database.Technical import Indicators, StreamTechnical
 from Strategy.Api import IdSend
 from Strategy.Machine import Machine
 from Strategy.Strategy import Strategy
+from Strategy.Transport import create_transport
+from Utility.RingBuffer import RingBuffer
 
 class NNFX(Strategy):
 
-    def __init__(self, db, iid, symbol, timeframe, logger):
-        super().__init__(iid, symbol, timeframe, logger)
+    def __init__(self, db, iid, symbol, timeframe, logger, transport=None):
+        super().__init__(iid, symbol, timeframe, logger, transport, snapshot=os.path.join(db.folder_path, f"NNFX_{iid}.npz"))
 
         self.db = db
         self.raw_dates = []
@@ -20,12 +27,15 @@ class NNFX(Strategy):
         self.raw_low_prices = []
         self.raw_close_prices = []
         self.raw_volumes = []
-        self.market_data = None
-        self.indicator_data = None
+        self.market_window = None
+        self.indicator_window = None
+        self.unsaved_bars = 0
+        self.technical = None
+        self.features = None
+        self.writer = None
+        self.pending = None
 
-        self.indicators = {"ATR": lambda lib, data: lib.ATR(data.High, data.Low, data.Close, timeperiod=14),
-                           "SMA10": lambda lib, data: lib.SMA(data.Close, timeperiod=10),
-                           "SMA20": lambda lib, data: lib.SMA(data.Close, timeperiod=20)}
+        self.indicators = {name: Indicators[name] for name in ("ATR", "SMA10", "SMA20")}
 
         self.risk_percentage = 2.0
         self.stop_loss_scale = 1.5
@@ -115,6 +125,7 @@ class NNFX(Strategy):
 
         start.on_symbol(action=self.symbol_action, to=start, reason="Symbol Received")
         start.on_bar(action=self.append_data_action, to=start, reason=None)
+        start.on_bars(action=self.append_bars_action, to=start, reason=None)
         start.on_complete(action=self.prepare_data_action, to=trading, reason="Prepared")
         start.on_shutdown(action=self.save_data_action, to=end, reason="Error")
 
@@ -134,28 +145,104 @@ class NNFX(Strategy):
         self.raw_close_prices.append(close_price)
         self.raw_volumes.append(volume)
 
+    def append_bars_action(self, dates, open_prices, high_prices, low_prices, close_prices, volumes):
+        self.raw_dates.extend(dates.tolist())
+        self.raw_open_prices.extend(open_prices.tolist())
+        self.raw_high_prices.extend(high_prices.tolist())
+        self.raw_low_prices.extend(low_prices.tolist())
+        self.raw_close_prices.extend(close_prices.tolist())
+        self.raw_volumes.extend(volumes.tolist())
+
+    def last_date(self):
+        return self.db.last_date()
+
+    def raw_data(self):
+        raw_data = {"Open": self.raw_open_prices, "High": self.raw_high_prices, "Low": self.raw_low_prices, "Close": self.raw_close_prices, "Volume": self.raw_volumes}
+        raw_index = pd.DatetimeIndex(np.array(self.raw_dates, dtype=np.int64).view("datetime64[ms]"), name="Date").tz_localize("UTC")
+        return pd.DataFrame(raw_data, index=raw_index)
+
     def prepare_data_action(self):
-        raw_data = {"Date": self.raw_dates, "Open": self.raw_open_prices, "High": self.raw_high_prices, "Low": self.raw_low_prices, "Close": self.raw_close_prices, "Volume": self.raw_volumes}
-        self.market_data =pd.DataFrame(raw_data).set_index("Date")
-        self.db.save_data(self.market_data)
-        self.market_data = self.db.load_data(start=self.raw_dates[0], end=self.raw_dates[-1], tail=self.window_size)
-        self.indicator_data = offline_technical(self.market_data, self.indicators)
+        self.features = FeatureStore(self.db, self.indicators, self.logger, name="NNFX")
+        self.technical = StreamTechnical(self.indicators)
+        if self.raw_dates:
+            self.features.save_data(self.raw_data())
+        state = self.load_snapshot()
+        if state is not None and self.restore_action(state):
+            return
+        market_data = self.db.load_data()
+        indicator_data = self.technical.warm(market_data)
+        self.market_window = RingBuffer.from_frame(market_data, self.window_size)
+        self.indicator_window = RingBuffer.from_frame(indicator_data, self.window_size)
+
+    def restore_action(self, state):
+        last_date = pd.Timestamp(state["MarketDates"][-1], unit="ms", tz="UTC") if len(state["MarketDates"]) else None
+        stored_date = self.db.last_date()
+        if last_date is None or "Technical" not in state or state["IndicatorNames"].tolist() != list(self.indicators) or int(state["WindowSize"]) != self.window_size or stored_date is None or stored_date < last_date:
+            self.logger.warning(f"NNFX {self.symbol} {self.timeframe}: Snapshot discarded, preparing from history")
+            return False
+        self.restore_machines(state)
+        self.market_window = RingBuffer.from_state({key[len("Market"):]: value for key, value in state.items() if key.startswith("Market")}, self.window_size)
+        self.indicator_window = RingBuffer.from_state({key[len("Indicator"):]: value for key, value in state.items() if key.startswith("Indicator")}, self.window_size)
+        self.current_atr_value = None if np.isnan(state["CurrentAtrValue"]) else float(state["CurrentAtrValue"])
+        self.technical.restore(state["Technical"])
+        fresh = self.db.load_data(start=last_date)
+        fresh = fresh[fresh.index > last_date]
+        for timestamp, bar in zip(fresh.index.as_unit("ms").asi8, fresh.itertuples(index=False, name=None)):
+            self.append_window(timestamp, *bar)
+        self.logger.info(f"NNFX {self.symbol} {self.timeframe}: [Restored: {len(self.market_window)} | Caught Up: {len(fresh)}]")
+        return True
+
+    def append_window(self, timestamp, open_price, high_price, low_price, close_price, volume):
+        self.market_window.append(timestamp, (open_price, high_price, low_price, close_price, volume))
+        self.indicator_window.append(timestamp, self.technical.update(open_price, high_price, low_price, close_price, volume))
 
     def process_signal_action(self, date, open_price, high_price, low_price, close_price, volume):
-        self.market_data.loc[date] = [open_price, high_price, low_price, close_price, volume]
-        self.indicator_data.loc[date] = online_technical(self.market_data, self.indicators)
-        previous = self.indicator_data.iloc[-2]
-        current = self.indicator_data.iloc[-1]
-        if current.SMA10 > current.SMA20 and previous.SMA10 < previous.SMA20:
-            self.current_atr_value = current.ATR
+        self.append_window(date, open_price, high_price, low_price, close_price, volume)
+        self.unsaved_bars += 1
+        if self.unsaved_bars == self.window_size:
+            self.flush_data()
+        previous, current = self.indicator_window.last(2)
+        atr, fast, slow = self.indicator_window.index["ATR"], self.indicator_window.index["SMA10"], self.indicator_window.index["SMA20"]
+        if current[fast] > current[slow] and previous[fast] < previous[slow]:
+            self.current_atr_value = current[atr]
             return IdSend.SignalBullishDynamic.value, self.risk_percentage, self.stop_loss_scale * self.current_atr_value / self.symbol_pip_size, None
-        if current.SMA10 < current.SMA20 and previous.SMA10 > previous.SMA20:
-            self.current_atr_value = current.ATR
+        if current[fast] < current[slow] and previous[fast] > previous[slow]:
+            self.current_atr_value = current[atr]
             return IdSend.SignalBearishDynamic.value, self.risk_percentage, self.stop_loss_scale * self.current_atr_value / self.symbol_pip_size, None
 
+    def flush_data(self):
+        data = (self.market_window.last_dates(self.unsaved_bars).copy(), self.market_window.last(self.unsaved_bars).copy()) if self.unsaved_bars else None
+        self.unsaved_bars = 0
+        if self.writer is None:
+            self.writer = ThreadPoolExecutor(1, thread_name_prefix=f"NNFX {self.symbol} {self.timeframe}")
+        if self.pending is not None:
+            self.pending.result()
+        self.pending = self.writer.submit(self.write_data, data, self.snapshot_state(**self.window_state()))
+
+    def write_data(self, data, state):
+        if data is not None:
+            self.features.save_data(self.market_window.frame(*data))
+        self.write_snapshot(state)
+
+    def window_state(self):
+        state = {"WindowSize": self.window_size, "CurrentAtrValue": np.nan if self.current_atr_value is None else self.current_atr_value, "Technical": self.technical.state()}
+        state.update({f"Market{key}": value for key, value in self.market_window.state().items()})
+        state.update({f"Indicator{key}": value for key, value in self.indicator_window.state().items()})
+        return state
+
     def save_data_action(self):
-        self.db.save_data(self.market_data)
+        if self.market_window is None:
+            if self.raw_dates:
+                self.db.save_data(self.raw_data())
+            self.db.clean_data()
+            return
+        self.flush_data()
+        self.pending.result()
+        self.pending = None
+        self.writer.shutdown()
+        self.writer = None
         self.db.clean_data()
+        self.features.store.clean_data()
 
 
 def main():
@@ -164,6 +251,7 @@ def main():
     parser.add_argument("--symbol", type=str, help="Symbol in which the robot will operate", required=True)
     parser.add_argument("--timeframe", type=str, help="Timeframe in which the robot will operate", required=True)
     parser.add_argument("--verbose", type=str, help="Logging verbose level", required=True)
+    parser.add_argument("--transport", type=str, help="Transport used to reach the robot", default=None, choices=["Pipe", "Socket"])
     args = parser.parse_args()
 
     iid = args.iid
@@ -171,9 +259,10 @@ def main():
     timeframe = args.timeframe.capitalize()
     verbose = args.verbose.upper()
     logger = Logger(verbose)
+    transport = create_transport(args.transport, iid, symbol, timeframe)
 
     db = Database("OHLCV", symbol, timeframe, logger)
-    strategy = NNFX(db, iid, symbol, timeframe, logger)
+    strategy = NNFX(db, iid, symbol, timeframe, logger, transport)
     strategy.run()
 
 
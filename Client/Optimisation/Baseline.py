@@ -3,64 +3,77 @@ import talib
 from backtesting import Strategy
 from backtesting.lib import crossover
 
+
+def close_series(self):
+    return self.data.Close
+
+
+def close_crossover_buy(self, indicator):
+    return crossover(self.data.Close, indicator)
+
+
+def close_crossover_sell(self, indicator):
+    return crossover(indicator, self.data.Close)
+
+
 BaselineIndicators = [
     {
         "name": "SMA",
-        "series": lambda self: self.data.Close,
+        "series": close_series,
         "ranges": {"timeperiod": range(5, 51, 1)},
-        "buy_signal": lambda self, indicator: crossover(self.data.Close, indicator),
-        "sell_signal": lambda self, indicator: crossover(indicator, self.data.Close)
+        "buy_signal": close_crossover_buy,
+        "sell_signal": close_crossover_sell
     },
     {
         "name": "EMA",
-        "series": lambda self: self.data.Close,
+        "series": close_series,
         "ranges": {"timeperiod": range(5, 51, 1)},
-        "buy_signal": lambda self, indicator: crossover(self.data.Close, indicator),
-        "sell_signal": lambda self, indicator: crossover(indicator, self.data.Close)
+        "buy_signal": close_crossover_buy,
+        "sell_signal": close_crossover_sell
     },
     {
         "name": "DEMA",
-        "series": lambda self: self.data.Close,
+        "series": close_series,
         "ranges": {"timeperiod": range(5, 51, 1)},
-        "buy_signal": lambda self, indicator: crossover(self.data.Close, indicator),
-        "sell_signal": lambda self, indicator: crossover(indicator, self.data.Close)
+        "buy_signal": close_crossover_buy,
+        "sell_signal": close_crossover_sell
     },
     {
         "name": "TEMA",
-        "series": lambda self: self.data.Close,
+        "series": close_series,
         "ranges": {"timeperiod": range(5, 51, 1)},
-        "buy_signal": lambda self, indicator: crossover(self.data.Close, indicator),
-        "sell_signal": lambda self, indicator: crossover(indicator, self.data.Close)
+        "buy_signal": close_crossover_buy,
+        "sell_signal": close_crossover_sell
     },
     {
         "name": "TRIMA",
-        "series": lambda self: self.data.Close,
+        "series": close_series,
         "ranges": {"timeperiod": range(5, 51, 1)},
-        "buy_signal": lambda self, indicator: crossover(self.data.Close, indicator),
-        "sell_signal": lambda self, indicator: crossover(indicator, self.data.Close)
+        "buy_signal": close_crossover_buy,
+        "sell_signal": close_crossover_sell
     },
     {
         "name": "WMA",
-        "series": lambda self: self.data.Close,
+        "series": close_series,
         "ranges": {"timeperiod": range(5, 51, 1)},
-        "buy_signal": lambda self, indicator: crossover(self.data.Close, indicator),
-        "sell_signal": lambda self, indicator: crossover(indicator, self.data.Close)
+        "buy_signal": close_crossover_buy,
+        "sell_signal": close_crossover_sell
     },
     {
         "name": "KAMA",
-        "series": lambda self: self.data.Close,
+        "series": close_series,
         "ranges": {"timeperiod": range(5, 51, 1)},
-        "buy_signal": lambda self, indicator: crossover(self.data.Close, indicator),
-        "sell_signal": lambda self, indicator: crossover(indicator, self.data.Close)
+        "buy_signal": close_crossover_buy,
+        "sell_signal": close_crossover_sell
     },
 ]
 """
     {
         "name": "MAMA",
-        "series": lambda self: self.data.Close,
+        "series": close_series,
         "ranges": {"fastlimit": 0.5, "slowlimit": 0.05},
-        "buy_signal": lambda self, indicator: crossover(self.data.Close, indicator),
-        "sell_signal": lambda self, indicator: crossover(indicator, self.data.Close)
+        "buy_signal": close_crossover_buy,
+        "sell_signal": close_crossover_sell
     },
 """
 
@@ -74,13 +87,23 @@ class BaselineStrategy(Strategy):
     buy_signal = None
     sell_signal = None
 
+    memo = None
+    fingerprint = None
+    atr_timeperiod = 14
+
     timeperiod = None
     fastlimit = None
     slowlimit = None
 
     def init(self):
-        self.indicator = self.I(getattr(talib, self.name), self.series())
-        self.atr = self.I(talib.ATR, self.data.High, self.data.Low, self.data.Close, timeperiod=14)
+        parameters = {parameter: getattr(self, parameter) for parameter in ("timeperiod", "fastlimit", "slowlimit") if getattr(self, parameter) is not None}
+        self.indicator = self.I(self.memoise, (self.name, self.series.__name__), getattr(talib, self.name), self.series(), name=self.name, **parameters)
+        self.atr = self.I(self.memoise, ("ATR",), talib.ATR, self.data.High, self.data.Low, self.data.Close, name="ATR", timeperiod=self.atr_timeperiod)
+
+    def memoise(self, key, function, *args, **parameters):
+        if self.memo is None:
+            return function(*args, **parameters)
+        return self.memo.compute((self.fingerprint, *key), function, *args, **parameters)
 
     def next(self):
 
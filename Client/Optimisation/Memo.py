@@ -0,0 +1,54 @@
+import os
+import hashlib
+import numpy as np
+
+from collections import OrderedDict
+
+
+class Memo:
+
+    def __init__(self, size=256, root=None):
+        self.size = size
+        self.root = root
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if self.root is not None:
+            os.makedirs(self.root, exist_ok=True)
+
+    def __getstate__(self):
+        return self.size, self.root
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    @staticmethod
+    def fingerprint(data):
+        digest = hashlib.sha1(np.ascontiguousarray(data.index.asi8).view(np.uint8))
+        for column in data.columns:
+            digest.update(column.encode())
+            digest.update(np.ascontiguousarray(data[column].to_numpy()).view(np.uint8))
+        return digest.hexdigest()
+
+    def compute(self, key, function, *args, **parameters):
+        digest = hashlib.sha1(repr((key, sorted((name, float(value)) for name, value in parameters.items()))).encode()).hexdigest()
+        if digest in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(digest)
+            return self.entries[digest]
+        file_path = os.path.join(self.root, f"{digest}.npy") if self.root is not None else None
+        if file_path is not None and os.path.exists(file_path):
+            self.hits += 1
+            value = np.load(file_path)
+        else:
+            self.misses += 1
+            value = np.asarray(function(*args, **parameters), dtype=float)
+            if file_path is not None:
+                temp_path = f"{file_path}_{os.getpid()}.npy"
+                np.save(temp_path, value)
+                os.replace(temp_path, file_path)
+        value.flags.writeable = False
+        self.entries[digest] = value
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        return value
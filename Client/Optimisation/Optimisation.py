@@ -1,22 +1,84 @@
+import os
 import time
+import itertools
+import tempfile
+import talib
+import backtesting
+import numpy as np
+import pandas as pd
+import multiprocessing as mp
 
+from types import SimpleNamespace
+from multiprocessing.pool import ThreadPool
 from backtesting import Backtest
 
+from Database.Cache import Cache
+from Database.Technical import batch_series, EMAChains
+from Optimisation.Memo import Memo
+from Optimisation.Results import Results
+from Optimisation.Search import Searcher
+from Optimisation.Vectorized import VectorizedBacktest
+
 SIZE = 52
 
+worker_data = None
+strategy_memo = {}
+
+
+def serial_pool(processes=None, initializer=None, initargs=()):
+    return ThreadPool(1, initializer, initargs)
+
+
+def initialise_worker(path, memo, fingerprint):
+    global worker_data
+    worker_data = Cache.open(path)
+    backtesting.Pool = serial_pool
+    strategy_memo.update(memo=memo, fingerprint=fingerprint)
+
+
+def optimise_chunk(strategy, indicator, ranges, capital, constraint=None):
+    Optimisation.configure_strategy(strategy, indicator, **strategy_memo)
+    backtest = Backtest(data=worker_data, strategy=strategy, cash=capital)
+    _, heatmap = backtest.optimize(**ranges, constraint=constraint, return_heatmap=True, maximize="SQN")
+    return heatmap
+
+
+class Pending:
+
+    def __init__(self, names, done):
+        self.names = names
+        self.done = done
+
+    def __call__(self, parameters):
+        return tuple(parameters[name] for name in self.names) not in self.done
+
+    def count(self, ranges):
+        return sum(self(dict(zip(self.names, point))) for point in itertools.product(*(values for _, values in Searcher.space(ranges))))
+
 
 class Optimisation:
 
     capital = 10000
+    chunk_size = 8
 
-    def __init__(self, role, data, strategy, indicators, metric):
+    def __init__(self, role, data, strategy, indicators, metric, workers=1, memo=None, engine="Backtest", search=None, results=None):
         self.role = role
         self.data = data
         self.strategy = strategy
         self.indicators = indicators
         self.metric = metric
+        self.workers = workers
+        self.memo = memo
+        self.engine = engine
+        self.search = search
+        self.results = results
+        self.fingerprint = Memo.fingerprint(data) if memo is not None else None
+        self.data_key = Results.data_key(data) if results is not None else None
 
+        self.batches = {}
         self.passes = 0
+        self.reused = 0
+        self.grid_size = sum(Searcher.size(indicator["ranges"]) for indicator in indicators)
         self.optimal_score = None
         self.optimal_stats = None
         self.optimal_backtest = None
@@ -27,6 +89,24 @@ class Optimisation:
     def unpack_indicator(indicator):
         return indicator["name"], indicator["series"], indicator["ranges"], indicator["buy_signal"], indicator["sell_signal"]
 
+    @staticmethod
+    def configure_strategy(strategy, indicator, memo=None, fingerprint=None):
+        name, series, _, buy_signal, sell_signal = Optimisation.unpack_indicator(indicator)
+        strategy.memo = memo
+        strategy.fingerprint = fingerprint
+        strategy.name = name
+        strategy.series = series
+        strategy.buy_signal = buy_signal
+        strategy.sell_signal = sell_signal
+
+    @staticmethod
+    def split_ranges(ranges, chunks):
+        parameter, values = next(iter(ranges.items()))
+        if not isinstance(values, (range, list, tuple)):
+            return [ranges]
+        size = -(-len(values) // chunks)
+        return [{**ranges, parameter: values[i:i + size]} for i in range(0, len(values), size)]
+
     @staticmethod
     def extract_parameters(stats, ranges):
         return {parameter: getattr(stats["_strategy"], parameter) for parameter in ranges.keys()}
@@ -39,11 +119,86 @@ class Optimisation:
             self.optimal_indicator = name
             self.optimal_parameters = parameters
 
+    @staticmethod
+    def batch_indicator(names, source, values):
+        batches = batch_series(names, source, values)
+        return np.stack([batches[name] for name in names])
+
+    def batch_names(self, indicator):
+        name, series, ranges, _, _ = self.unpack_indicator(indicator)
+        if name not in EMAChains:
+            return (name,)
+        first = next(iter(ranges.items()))
+        return tuple(other["name"] for other in self.indicators if other["name"] in EMAChains and other["series"] is series and next(iter(other["ranges"].items())) == first)
+
+    def warmup(self):
+        high, low, close = (self.data[column].to_numpy(dtype=float) for column in ("High", "Low", "Close"))
+        atr = self.memoise(("ATR",), talib.ATR, high, low, close, timeperiod=self.strategy.atr_timeperiod)
+        return int(np.isnan(atr).argmin())
+
+    def indicator_matrix(self, indicator):
+        name, series, ranges, _, _ = self.unpack_indicator(indicator)
+        parameter, values = next(iter(ranges.items()))
+        source = np.asarray(series(SimpleNamespace(data=self.data)), dtype=float)
+        if parameter == "timeperiod":
+            names = self.batch_names(indicator)
+            key = (names, series.__name__, tuple(values))
+            if key not in self.batches:
+                self.batches[key] = self.memoise(key, self.batch_indicator, list(names), source, values)
+            batch = self.batches.pop(key) if name == names[-1] else self.batches[key]
+            return batch[names.index(name)]
+        return np.column_stack([self.memoise((name, series.__name__), getattr(talib, name), source, **{parameter: value}) for value in values])
+
+    @staticmethod
+    def best_parameters(heatmap):
+        best = heatmap.idxmax(skipna=True) if not heatmap.isna().all() else heatmap.index[0]
+        return dict(zip(heatmap.index.names, best if isinstance(best, tuple) else (best,)))
+
+    @staticmethod
+    def align_heatmap(heatmap, ranges):
+        return heatmap.reorder_levels(list(ranges)) if heatmap.index.nlevels > 1 else heatmap
+
+    def stored_heatmap(self, indicator):
+        names = list(indicator["ranges"].keys())
+        if self.results is None:
+            return pd.Series(dtype=float, name="SQN", index=pd.MultiIndex.from_tuples([], names=names))
+        return self.results.load(Results.strategy_hash(self.strategy, indicator), indicator["name"], self.data_key, names)
+
+    def store_heatmap(self, indicator, heatmap):
+        if self.results is not None and len(heatmap):
+            self.results.save(Results.strategy_hash(self.strategy, indicator), indicator["name"], self.data_key, heatmap)
+
+    def pending_chunks(self, ranges, stored):
+        pending = Pending(list(ranges), set(stored.index))
+        chunks = -(-Searcher.size(ranges) // self.chunk_size) if self.results is not None and len(stored) else 1
+        return pending, [chunk for chunk in self.split_ranges(ranges, chunks) if pending.count(chunk)]
+
+    def memoise(self, key, function, *args, **parameters):
+        if self.memo is None:
+            return function(*args, **parameters)
+        return self.memo.compute((self.fingerprint, *key), function, *args, **parameters)
+
     def run(self):
         outer_start_time = time.time()
 
         self.print_optimisation_start()
 
+        if self.search is not None:
+            self.run_search()
+        elif self.engine == "Vectorized":
+            self.run_vectorized()
+        elif self.workers > 1:
+            self.run_parallel()
+        else:
+            self.run_serial()
+
+        outer_end_time = time.time()
+
+        self.print_optimisation_finish(outer_end_time - outer_start_time)
+
+        return self.optimal_backtest, self.optimal_indicator, self.optimal_parameters
+
+    def optimise(self, best_stats):
         for indicator in self.indicators:
 
             inner_start_time = time.time()
@@ -52,17 +207,12 @@ class Optimisation:
 
             self.print_indicator_start(name)
 
-            self.strategy.name = name
-            self.strategy.series = series
-            self.strategy.buy_signal = buy_signal
-            self.strategy.sell_signal = buy_signal
+            self.configure_strategy(self.strategy, indicator, self.memo, self.fingerprint)
 
             backtest = Backtest(data=self.data, strategy=self.strategy, cash=self.capital)
-            stats, heatmap = backtest.optimize(**ranges, return_heatmap=True, maximize="SQN")
+            stats = best_stats(indicator, backtest)
             score = self.metric(stats)
 
-            self.passes += len(heatmap)
-
             parameters = self.extract_parameters(stats, ranges)
 
             self.update_optimal(score, backtest, stats, name, parameters)
@@ -71,11 +221,101 @@ class Optimisation:
 
             self.print_indicator_finish(parameters, score, inner_end_time - inner_start_time)
 
-        outer_end_time = time.time()
+    def run_serial(self):
+        def best_stats(indicator, backtest):
+            ranges = indicator["ranges"]
+            heatmaps = [self.stored_heatmap(indicator)]
+            pending, chunks = self.pending_chunks(ranges, heatmaps[0])
+            for chunk in chunks:
+                _, heatmap = backtest.optimize(**chunk, constraint=pending if len(pending.done) else None, return_heatmap=True, maximize="SQN")
+                heatmaps.append(self.align_heatmap(heatmap, ranges))
+                self.store_heatmap(indicator, heatmap)
+                self.passes += len(heatmap)
+            self.reused += len(heatmaps[0])
+            return backtest.run(**self.best_parameters(pd.concat(heatmaps)))
 
-        self.print_optimisation_finish(outer_end_time - outer_start_time)
+        self.optimise(best_stats)
 
-        return self.optimal_backtest, self.optimal_indicator, self.optimal_parameters
+    def run_parallel(self):
+        chunks = -(-self.workers // len(self.indicators))
+
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "Data")
+            Cache.write(path, self.data)
+
+            with mp.get_context("spawn").Pool(self.workers, initialise_worker, (path, self.memo, self.fingerprint)) as pool:
+                tasks = []
+                for indicator in self.indicators:
+                    stored = self.stored_heatmap(indicator)
+                    pending = Pending(list(indicator["ranges"]), set(stored.index))
+                    chunked = [chunk for chunk in self.split_ranges(indicator["ranges"], chunks) if pending.count(chunk)]
+                    tasks.append((stored, [pool.apply_async(optimise_chunk, (self.strategy, indicator, chunk, self.capital, pending if len(pending.done) else None)) for chunk in chunked]))
+                collected = iter(tasks)
+
+                def best_stats(indicator, backtest):
+                    stored, results = next(collected)
+                    heatmaps = [stored]
+                    for result in results:
+                        heatmap = result.get()
+                        heatmaps.append(self.align_heatmap(heatmap, indicator["ranges"]))
+                        self.store_heatmap(indicator, heatmap)
+                        self.passes += len(heatmap)
+                    self.reused += len(stored)
+                    return backtest.run(**self.best_parameters(pd.concat(heatmaps)))
+
+                self.optimise(best_stats)
+
+    def run_vectorized(self):
+        engine = VectorizedBacktest(self.data, self.capital)
+        warmup = self.warmup()
+
+        def best_stats(indicator, backtest):
+            parameter, values = next(iter(indicator["ranges"].items()))
+            indicators = self.indicator_matrix(indicator)
+            stored = self.stored_heatmap(indicator)
+            if len(stored) and not Pending([parameter], set(stored.index)).count(indicator["ranges"]):
+                column = list(values).index(self.best_parameters(stored.reindex(pd.MultiIndex.from_arrays([list(values)], names=[parameter])))[parameter])
+                self.reused += len(values)
+                return engine.stats(engine.run(indicators[:, [column]], warmup), 0, {parameter: values[column]})
+            stats, heatmap = engine.optimize(indicators, parameter, values, warmup)
+            self.store_heatmap(indicator, heatmap)
+            self.passes += len(heatmap)
+            return stats
+
+        self.optimise(best_stats)
+
+    def evaluator(self, indicator):
+        backtests = {}
+        stored = dict(self.stored_heatmap(indicator).items())
+        names = list(indicator["ranges"].keys())
+
+        def evaluate(parameters, fraction=1.0):
+            point = tuple(parameters[name] for name in names)
+            if fraction == 1.0 and point in stored:
+                self.reused += 1
+                return stored[point]
+            if fraction not in backtests:
+                data = self.data.iloc[-max(int(len(self.data) * fraction), 1):]
+                fingerprint = Memo.fingerprint(data) if self.memo is not None else None
+                backtests[fraction] = (Backtest(data=data, strategy=self.strategy, cash=self.capital), fingerprint)
+            backtest, fingerprint = backtests[fraction]
+            self.configure_strategy(self.strategy, indicator, self.memo, fingerprint)
+            value = backtest.run(**parameters)["SQN"]
+            if fraction == 1.0:
+                self.store_heatmap(indicator, pd.Series([value], name="SQN", index=pd.MultiIndex.from_tuples([point], names=names)))
+            return value
+
+        return evaluate
+
+    def run_search(self):
+        def best_stats(indicator, backtest):
+            reused = self.reused
+            best = self.search.search(self.evaluator(indicator), indicator["ranges"])
+            self.passes += self.search.passes - (self.reused - reused)
+            self.configure_strategy(self.strategy, indicator, self.memo, self.fingerprint)
+            return backtest.run(**best)
+
+        self.optimise(best_stats)
 
     @staticmethod
     def format_print(label, value):
@@ -101,6 +341,8 @@ class Optimisation:
         print(" Optimisation Summary ".center(SIZE, "-"))
         print(self.format_print("Time Elapsed", f"{elapsed} secs"))
         print(self.format_print("Total Passes", self.passes))
+        print(self.format_print("Reused Passes", self.reused))
+        print(self.format_print("Grid Size", self.grid_size))
         print(self.format_print("Optimal Score", self.optimal_score))
         print(self.format_print("Optimal Indicator", self.optimal_indicator))
         print("Optimal Parameters:".ljust(SIZE))
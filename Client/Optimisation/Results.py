@@ -0,0 +1,76 @@
+import os
+import json
+import inspect
+import sqlite3
+import hashlib
+import numpy as np
+import pandas as pd
+
+from Optimisation.Memo import Memo
+
+
+class Results:
+
+    def __init__(self, path=None):
+        self.path = path if path is not None else os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Database", "Results.sqlite")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS Results (
+                Strategy TEXT NOT NULL,
+                Indicator TEXT NOT NULL,
+                Parameters TEXT NOT NULL,
+                Data TEXT NOT NULL,
+                Start TEXT NOT NULL,
+                End TEXT NOT NULL,
+                Metric TEXT NOT NULL,
+                Value REAL,
+                PRIMARY KEY (Strategy, Indicator, Data, Metric, Parameters)
+            )
+        """)
+        self.connection.commit()
+
+    def __getstate__(self):
+        return self.path
+
+    def __setstate__(self, state):
+        self.__init__(state)
+
+    @staticmethod
+    def strategy_hash(strategy, indicator):
+        digest = hashlib.sha1(inspect.getsource(strategy).encode())
+        for function in (indicator["series"], indicator["buy_signal"], indicator["sell_signal"]):
+            digest.update(inspect.getsource(function).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def data_key(data):
+        return Memo.fingerprint(data), str(data.index[0]), str(data.index[-1])
+
+    @staticmethod
+    def encode(parameters):
+        return json.dumps({name: np.asarray(value).item() for name, value in parameters.items()}, sort_keys=True)
+
+    def load(self, strategy, indicator, data, names, metric="SQN"):
+        rows = self.connection.execute(
+            "SELECT Parameters, Value FROM Results WHERE Strategy = ? AND Indicator = ? AND Data = ? AND Metric = ?",
+            (strategy, indicator, data[0], metric)).fetchall()
+        parameters = [json.loads(row[0]) for row in rows]
+        index = pd.MultiIndex.from_tuples([tuple(point[name] for name in names) for point in parameters], names=names) if rows else pd.MultiIndex.from_tuples([], names=names)
+        return pd.Series([np.nan if row[1] is None else row[1] for row in rows], index=index, name=metric, dtype=float)
+
+    def save(self, strategy, indicator, data, heatmap, metric="SQN"):
+        rows = [(strategy, indicator, self.encode(dict(zip(heatmap.index.names, point if isinstance(point, tuple) else (point,)))), *data, metric, None if np.isnan(value) else float(value)) for point, value in heatmap.items()]
+        self.connection.executemany("INSERT OR REPLACE INTO Results VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        self.connection.commit()
+
+    def heatmaps(self, indicator=None, metric="SQN"):
+        query = "SELECT Strategy, Indicator, Data, Start, End, Parameters, Value FROM Results WHERE Metric = ?"
+        arguments = [metric]
+        if indicator is not None:
+            query += " AND Indicator = ?"
+            arguments.append(indicator)
+        data = pd.read_sql_query(query, self.connection, params=arguments)
+        parameters = pd.json_normalize(data.pop("Parameters").map(json.loads).tolist())
+        return pd.concat([data.drop(columns="Value"), parameters, data["Value"].rename(metric)], axis=1)
@@ -0,0 +1,171 @@
+import time
+import numpy as np
+
+from abc import ABC, abstractmethod
+
+
+class Searcher(ABC):
+
+    def __init__(self, passes=None, seconds=None, seed=None):
+        self.budget = passes
+        self.seconds = seconds
+        self.seed = seed
+        self.rng = None
+        self.start_time = None
+        self.passes = 0
+        self.history = {}
+        self.leaders = {}
+
+    @staticmethod
+    def space(ranges):
+        return [(parameter, list(values) if isinstance(values, (range, list, tuple, np.ndarray)) else [values]) for parameter, values in ranges.items()]
+
+    @staticmethod
+    def size(ranges):
+        return int(np.prod([len(values) for _, values in Searcher.space(ranges)]))
+
+    @staticmethod
+    def parameters(space, point):
+        return {parameter: values[i] for (parameter, values), i in zip(space, point)}
+
+    def exhausted(self, space):
+        if self.budget is not None and self.passes >= self.budget:
+            return True
+        if self.seconds is not None and time.time() - self.start_time >= self.seconds:
+            return True
+        return len(self.history) >= int(np.prod([len(values) for _, values in space]))
+
+    def observe(self, evaluate, space, point, fraction=1.0):
+        score = evaluate(self.parameters(space, point), fraction)
+        self.passes += 1
+        score = float(score) if score is not None and not np.isnan(score) else -np.inf
+        if fraction == 1.0:
+            self.history[point] = score
+        self.leaders[point] = max(self.leaders.get(point, (0.0, -np.inf)), (fraction, score))
+        return score
+
+    def sample(self, space):
+        while True:
+            point = tuple(int(self.rng.integers(len(values))) for _, values in space)
+            if point not in self.history:
+                return point
+
+    def search(self, evaluate, ranges):
+        space = self.space(ranges)
+        self.rng = np.random.default_rng(self.seed)
+        self.start_time = time.time()
+        self.passes = 0
+        self.history = {}
+        self.leaders = {}
+        self.explore(evaluate, space)
+        point = max(self.leaders, key=self.leaders.get) if self.leaders else tuple(0 for _ in space)
+        return self.parameters(space, point)
+
+    @abstractmethod
+    def explore(self, evaluate, space):
+        pass
+
+
+class RandomSearch(Searcher):
+
+    def __init__(self, passes=50, seconds=None, seed=None):
+        super().__init__(passes, seconds, seed)
+
+    def explore(self, evaluate, space):
+        while not self.exhausted(space):
+            self.observe(evaluate, space, self.sample(space))
+
+
+class HalvingSearch(Searcher):
+
+    def __init__(self, passes=None, candidates=27, eta=3, seconds=None, seed=None):
+        super().__init__(passes, seconds, seed)
+        self.candidates = candidates
+        self.eta = eta
+
+    def rungs(self, count):
+        return max(int(np.ceil(np.log(count) / np.log(self.eta))), 1)
+
+    def cost(self, count):
+        passes = 0
+        for _ in range(self.rungs(count)):
+            passes += count
+            count = max(count // self.eta, 1)
+        return passes
+
+    def affordable(self, size):
+        count = min(self.candidates, size)
+        while self.budget is not None and count > 1 and self.cost(count) > self.budget:
+            count -= 1
+        return count
+
+    def explore(self, evaluate, space):
+        size = int(np.prod([len(values) for _, values in space]))
+        count = self.affordable(size)
+        points = list(np.ndindex(*(len(values) for _, values in space))) if size <= count else []
+        while len(points) < count:
+            point = self.sample(space)
+            if point not in points:
+                points.append(point)
+
+        rungs = self.rungs(len(points))
+        for rung in range(rungs):
+            fraction = float(self.eta) ** (rung + 1 - rungs)
+            scores = []
+            for point in points:
+                if self.exhausted(space):
+                    return
+                scores.append(self.observe(evaluate, space, point, fraction))
+            survivors = max(len(points) // self.eta, 1)
+            points = [points[i] for i in np.argsort(scores, kind="stable")[::-1][:survivors]]
+
+
+class TPESearch(Searcher):
+
+    def __init__(self, passes=50, startup=10, gamma=0.25, candidates=24, seconds=None, seed=None):
+        super().__init__(passes, seconds, seed)
+        self.startup = startup
+        self.gamma = gamma
+        self.candidates = candidates
+
+    @staticmethod
+    def density(points, values, bandwidth, size):
+        if not len(points):
+            return np.full(len(values), 1.0 / size)
+        kernels = np.exp(-0.5 * ((values[:, None] - points[None, :]) / bandwidth) ** 2)
+        return (kernels.sum(axis=1) + 1.0 / size) / (len(points) + 1)
+
+    def propose(self, space):
+        points = np.array(list(self.history.keys()), dtype=float)
+        scores = np.array(list(self.history.values()))
+        order = np.argsort(scores, kind="stable")[::-1]
+        count = max(int(np.ceil(self.gamma * len(order))), 1)
+        good, bad = points[order[:count]], points[order[count:]]
+
+        proposals = np.empty((self.candidates, len(space)))
+        ratio = np.zeros(self.candidates)
+        for d, (_, values) in enumerate(space):
+            size = len(values)
+            bandwidth = max(size / 10, 1.0)
+            centres = good[self.rng.integers(len(good), size=self.candidates), d]
+            proposals[:, d] = np.clip(np.rint(centres + self.rng.normal(0.0, bandwidth, self.candidates)), 0, size - 1)
+            ratio += np.log(self.density(good[:, d], proposals[:, d], bandwidth, size))
+            ratio -= np.log(self.density(bad[:, d], proposals[:, d], bandwidth, size))
+
+        for i in np.argsort(ratio, kind="stable")[::-1]:
+            point = tuple(int(value) for value in proposals[i])
+            if point not in self.history:
+                return point
+        return self.sample(space)
+
+    def explore(self, evaluate, space):
+        while not self.exhausted(space):
+            point = self.sample(space) if len(self.history) < self.startup else self.propose(space)
+            self.observe(evaluate, space, point)
+
+
+Searchers = {
+    "Random": RandomSearch,
+    "Halving": HalvingSearch,
+    "TPE": TPESearch,
+}
@@ -0,0 +1,106 @@
+import sys
+import numpy as np
+import pandas as pd
+
+from types import SimpleNamespace
+
+FullEquity = 1 - sys.float_info.epsilon
+
+
+class VectorizedBacktest:
+
+    def __init__(self, data, cash=10000):
+        self.data = data
+        self.cash = cash
+        self.open = data.Open.to_numpy(dtype=float)
+        self.close = data.Close.to_numpy(dtype=float)
+
+    def signals(self, indicators, warmup=0):
+        close = self.close[:, None]
+        signals = np.zeros(indicators.shape, dtype=np.int8)
+        with np.errstate(invalid="ignore"):
+            signals[1:][(close[:-1] < indicators[:-1]) & (close[1:] > indicators[1:])] = 1
+            signals[1:][(indicators[:-1] < close[:-1]) & (indicators[1:] > close[1:])] = -1
+        start = 1 + np.maximum(np.isnan(indicators).argmin(axis=0), warmup)
+        signals[np.arange(len(signals))[:, None] < start] = 0
+        signals[-1] = 0
+        return signals
+
+    def run(self, indicators, warmup=0):
+        signals = self.signals(indicators, warmup)
+        columns, bars = np.nonzero(signals.T)
+        counts = np.bincount(columns, minlength=signals.shape[1])
+        rank = np.arange(len(columns)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        shape = (max(counts.max(initial=0), 1), signals.shape[1])
+        entry_bars = np.zeros(shape, dtype=np.int64)
+        directions = np.zeros(shape, dtype=np.int64)
+        entry_bars[rank, columns] = bars + 1
+        directions[rank, columns] = signals[bars, columns]
+        entry_prices = self.open[entry_bars]
+
+        sizes = np.zeros(shape, dtype=np.int64)
+        cash_before = np.zeros(shape)
+        pl = np.full(shape, np.nan)
+        returns = np.full(shape, np.nan)
+        cash = np.full(shape[1], float(self.cash))
+        for k in range(shape[0]):
+            cash_before[k] = cash
+            sizes[k] = np.where(k < counts, directions[k] * np.floor_divide(cash * FullEquity, entry_prices[k]), 0)
+            if k + 1 < shape[0]:
+                closed = k + 1 < counts
+                exit_prices = entry_prices[k + 1]
+                pl[k] = np.where(closed, sizes[k] * (exit_prices - entry_prices[k]), np.nan)
+                returns[k] = np.where(closed, directions[k] * (exit_prices / entry_prices[k] - 1), np.nan)
+                cash = np.where(closed, cash + pl[k], cash)
+
+        executions = np.zeros(signals.shape, dtype=np.int64)
+        executions[1:] = signals[:-1] != 0
+        trade = np.cumsum(executions, axis=0) - 1
+        current = np.maximum(trade, 0)
+        unrealised = np.take_along_axis(sizes, current, axis=0) * (self.close[:, None] - np.take_along_axis(entry_prices, current, axis=0))
+        equity = np.where(trade >= 0, np.take_along_axis(cash_before, current, axis=0) + unrealised, float(self.cash))
+
+        return SimpleNamespace(counts=np.maximum(counts - 1, 0), pl=pl, returns=returns, equity=equity)
+
+    def stats(self, result, column, parameters):
+        count = int(result.counts[column])
+        pl = pd.Series(result.pl[:count, column])
+        returns = pd.Series(result.returns[:count, column])
+        equity = result.equity[:, column]
+        index = self.data.index
+
+        s = dict()
+        s["Start"] = index[0]
+        s["End"] = index[-1]
+        s["Duration"] = s["End"] - s["Start"]
+        s["Equity Final [$]"] = equity[-1]
+        s["Equity Peak [$]"] = equity.max()
+        s["Return [%]"] = (equity[-1] - equity[0]) / equity[0] * 100
+        s["Max. Drawdown [%]"] = -np.nan_to_num((1 - equity / np.maximum.accumulate(equity)).max()) * 100
+        s["# Trades"] = count
+        s["Win Rate [%]"] = (np.nan if not count else (pl > 0).mean()) * 100
+        s["Best Trade [%]"] = returns.max() * 100
+        s["Worst Trade [%]"] = returns.min() * 100
+        growth = returns.fillna(0) + 1
+        s["Avg. Trade [%]"] = (0 if np.any(growth <= 0) else np.exp(np.log(growth).sum() / (count or np.nan)) - 1) * 100
+        s["Profit Factor"] = returns[returns > 0].sum() / (abs(returns[returns < 0].sum()) or np.nan)
+        s["Expectancy [%]"] = returns.mean() * 100
+        s["SQN"] = np.sqrt(count) * pl.mean() / (pl.std() or np.nan)
+        s["_strategy"] = SimpleNamespace(**parameters)
+        return pd.Series(s, dtype=object)
+
+    @staticmethod
+    def sqn(result):
+        counts = result.counts
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.nansum(result.pl, axis=0) / counts
+            std = np.sqrt(np.nansum((result.pl - mean) ** 2, axis=0) / (counts - 1))
+            return np.where(counts > 0, np.sqrt(counts) * mean / np.where(std == 0, np.nan, std), np.nan)
+
+    def optimize(self, indicators, parameter, values, warmup=0):
+        result = self.run(indicators, warmup)
+        sqn = self.sqn(result)
+        heatmap = pd.Series(sqn, name="SQN", index=pd.MultiIndex.from_arrays([list(values)], names=[parameter]))
+        best = int(np.nanargmax(sqn)) if not np.isnan(sqn).all() else 0
+        return self.stats(result, best, {parameter: values[best]}), heatmap
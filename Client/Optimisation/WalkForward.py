@@ -0,0 +1,145 @@
+import os
+import time
+import tempfile
+import numpy as np
+import pandas as pd
+import multiprocessing as mp
+
+from Database.Cache import Cache
+from Optimisation.Optimisation import Optimisation, SIZE
+from Optimisation.Vectorized import VectorizedBacktest
+
+worker_folds = None
+
+
+def initialise_fold_worker(path, names, warmup, indicators, metric, capital):
+    global worker_folds
+    data = Cache.open(os.path.join(path, "Data"))
+    matrices = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in names}
+    worker_folds = (data, matrices, warmup, indicators, metric, capital)
+
+
+def evaluate_worker_fold(fold):
+    return evaluate_fold(*worker_folds, fold)
+
+
+def score_stats(metric, stats):
+    try:
+        return metric(stats)
+    except ZeroDivisionError:
+        return np.nan
+
+
+def evaluate_fold(data, matrices, warmup, indicators, metric, capital, fold):
+    train_start, test_start, test_end = fold
+    train = VectorizedBacktest(data.iloc[train_start:test_start], capital)
+
+    optimal = None
+    for indicator in indicators:
+        name, _, ranges, _, _ = Optimisation.unpack_indicator(indicator)
+        parameter, values = next(iter(ranges.items()))
+        stats, heatmap = train.optimize(matrices[name][train_start:test_start], parameter, values, max(warmup - train_start, 0))
+        score = score_stats(metric, stats)
+        if optimal is None or not optimal[0] or optimal[0] < score:
+            optimal = (score, stats, name, parameter, list(values).index(getattr(stats["_strategy"], parameter)))
+
+    score, stats, name, parameter, column = optimal
+    test = VectorizedBacktest(data.iloc[test_start:test_end], capital)
+    result = test.run(matrices[name][test_start:test_end, [column]], max(warmup - test_start, 0))
+    test_stats = test.stats(result, 0, {parameter: getattr(stats["_strategy"], parameter)})
+
+    return {
+        "Train Start": data.index[train_start],
+        "Test Start": data.index[test_start],
+        "Test End": data.index[test_end - 1],
+        "Indicator": name,
+        "Parameters": {parameter: getattr(stats["_strategy"], parameter)},
+        "In-Sample Score": score,
+        "In-Sample SQN": stats["SQN"],
+        "Out-Of-Sample Score": score_stats(metric, test_stats),
+        "Out-Of-Sample SQN": test_stats["SQN"],
+        "Out-Of-Sample Return [%]": test_stats["Return [%]"],
+        "Out-Of-Sample # Trades": test_stats["# Trades"],
+    }
+
+
+class WalkForward(Optimisation):
+
+    def __init__(self, role, data, strategy, indicators, metric, train_size, test_size, anchored=False, workers=1, memo=None):
+        super().__init__(role, data, strategy, indicators, metric, workers=workers, memo=memo, engine="Vectorized")
+        self.train_size = train_size
+        self.test_size = test_size
+        self.anchored = anchored
+        self.folds_frame = None
+
+    def folds(self):
+        folds = []
+        for test_start in range(self.train_size, len(self.data) - self.test_size + 1, self.test_size):
+            train_start = 0 if self.anchored else test_start - self.train_size
+            folds.append((train_start, test_start, test_start + self.test_size))
+        if not folds:
+            raise ValueError(f"Walk-forward needs at least {self.train_size + self.test_size} bars, received {len(self.data)}")
+        folds[-1] = (*folds[-1][:2], len(self.data))
+        return folds
+
+    def run(self):
+        outer_start_time = time.time()
+
+        self.print_optimisation_start()
+
+        warmup = self.warmup()
+        matrices = {indicator["name"]: self.indicator_matrix(indicator) for indicator in self.indicators}
+        folds = self.folds()
+
+        if self.workers > 1:
+            with tempfile.TemporaryDirectory() as root:
+                Cache.write(os.path.join(root, "Data"), self.data)
+                for name, matrix in matrices.items():
+                    np.save(os.path.join(root, f"{name}.npy"), matrix)
+                arguments = (root, list(matrices), warmup, self.indicators, self.metric, self.capital)
+                with mp.get_context("spawn").Pool(self.workers, initialise_fold_worker, arguments) as pool:
+                    results = pool.map(evaluate_worker_fold, folds)
+        else:
+            results = [evaluate_fold(self.data, matrices, warmup, self.indicators, self.metric, self.capital, fold) for fold in folds]
+
+        self.passes = len(folds) * sum(len(next(iter(indicator["ranges"].values()))) for indicator in self.indicators)
+        self.folds_frame = pd.DataFrame(results, index=pd.RangeIndex(1, len(results) + 1, name="Fold"))
+
+        for fold, result in self.folds_frame.iterrows():
+            self.print_fold(fold, result)
+
+        outer_end_time = time.time()
+
+        self.print_walk_forward_finish(outer_end_time - outer_start_time)
+
+        return self.folds_frame, self.stability()
+
+    def stability(self):
+        results = self.folds_frame
+        choices = list(zip(results["Indicator"], results["Parameters"].map(lambda parameters: tuple(parameters.items()))))
+        in_sample = results["In-Sample SQN"].astype(float)
+        out_of_sample = results["Out-Of-Sample SQN"].astype(float)
+        return pd.Series({
+            "Folds": len(results),
+            "Mean Out-Of-Sample Score": results["Out-Of-Sample Score"].astype(float).mean(),
+            "Std Out-Of-Sample Score": results["Out-Of-Sample Score"].astype(float).std(),
+            "Mean Out-Of-Sample SQN": out_of_sample.mean(),
+            "SQN Efficiency": out_of_sample.mean() / in_sample.mean() if in_sample.mean() else np.nan,
+            "Profitable Folds [%]": (results["Out-Of-Sample Return [%]"].astype(float) > 0).mean() * 100,
+            "Parameter Stability [%]": np.mean([previous == current for previous, current in zip(choices, choices[1:])]) * 100 if len(choices) > 1 else np.nan,
+        }, dtype=object)
+
+    def print_fold(self, fold, result):
+        print(f" Fold {fold} ".center(SIZE, "-"))
+        for key in ("Train Start", "Test Start", "Test End", "Indicator", "In-Sample Score", "Out-Of-Sample Score", "Out-Of-Sample Return [%]"):
+            print(self.format_print(key, result[key]))
+        for param, value in result["Parameters"].items():
+            print(self.format_print(param, value))
+
+    def print_walk_forward_finish(self, elapsed):
+        print(" Walk-Forward Summary ".center(SIZE, "-"))
+        print(self.format_print("Time Elapsed", f"{elapsed} secs"))
+        print(self.format_print("Total Passes", self.passes))
+        for key, value in self.stability().items():
+            print(self.format_print(key, value))
+        print("-" * SIZE)
@@ -3,7 +3,12 @@ import argparse
 
 from Utility.Logger import Logger
 from Database.Database import Database
+from Database.Cache import Cache
 from Optimisation.Optimisation import Optimisation
+from Optimisation.WalkForward import WalkForward
+from Optimisation.Memo import Memo
+from Optimisation.Results import Results
+from Optimisation.Search import Searchers
 from Optimisation.Baseline import BaselineIndicators, BaselineStrategy, BaselineMetric
 
 
@@ -12,6 +17,14 @@ def main():
     parser.add_argument("--verbose", type=str, help="Logging verbose level", default="Debug", choices=["Error", "Warning", "Info", "Debug"])
     parser.add_argument("--symbol", type=str, help="Symbol in which the robot will operate", required=True)
     parser.add_argument("--timeframe", type=str, help="Timeframe in which the robot will operate", required=True)
+    parser.add_argument("--workers", type=int, help="Optimisation worker processes", default=1)
+    parser.add_argument("--engine", type=str, help="Backtest engine used for the grid", default="Backtest", choices=["Backtest", "Vectorized"])
+    parser.add_argument("--search", type=str, help="Searcher used instead of the exhaustive grid", default=None, choices=list(Searchers.keys()))
+    parser.add_argument("--passes", type=int, help="Searcher pass budget per indicator", default=None)
+    parser.add_argument("--seconds", type=float, help="Searcher time budget per indicator", default=None)
+    parser.add_argument("--train", type=int, help="Walk-forward training window in bars", default=None)
+    parser.add_argument("--test", type=int, help="Walk-forward testing window in bars", default=None)
+    parser.add_argument("--anchored", action="store_true", help="Anchor walk-forward training windows at the first bar")
     args = parser.parse_args()
 
     verbose = args.verbose.upper()
@@ -19,12 +32,23 @@ def main():
     timeframe = args.timeframe.capitalize()
     logger = Logger(verbose)
 
-    db = Database(symbol, timeframe, logger)
-    data = db.load_data(start="01-01-2015")
+    db = Database("OHLCV", symbol, timeframe, logger)
+    data = Cache(db, logger).load_data(start="01-01-2015")
+    results = Results()
+    memo = Memo(root=os.path.join(os.path.dirname(os.path.abspath(__file__)), "Database", "Cache", "Indicators"))
 
     os.makedirs(f"{os.path.dirname(os.path.abspath(__file__))}\\{symbol}\\{timeframe}", exist_ok=True)
 
-    bl_backtest, bl_indicator, bl_parameters = Optimisation("Baseline", data, BaselineStrategy, BaselineIndicators, BaselineMetric).run()
+    search = None
+    if args.search is not None:
+        budget = {"passes": args.passes} if args.passes is not None else {}
+        search = Searchers[args.search](seconds=args.seconds, **budget)
+
+    if args.train is not None:
+        WalkForward("Baseline", data, BaselineStrategy, BaselineIndicators, BaselineMetric, args.train, args.test or args.train // 4, anchored=args.anchored, workers=args.workers, memo=memo).run()
+        return
+
+    bl_backtest, bl_indicator, bl_parameters = Optimisation("Baseline", data, BaselineStrategy, BaselineIndicators, BaselineMetric, workers=args.workers, memo=memo, engine=args.engine, search=search, results=results).run()
 
     # bl_backtest.plot(filename=f"{folder}/Baseline_{bl_indicator}.html")
     # sns.heatmap(best_heatmap.groupby(list(best_params.keys())).mean().unstack(), cmap="plasma")
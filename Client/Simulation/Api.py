@@ -0,0 +1,82 @@
+import struct
+import numpy as np
+
+from Strategy.Api import IdSend, IdReceive, Sentinel, BarRecord, HeaderCodec, AccountCodec, SymbolCodec, PositionCodec, BarCodec, TargetCodec, CountCodec
+from Strategy.Transport import Reader
+
+SignalContentCodec = struct.Struct("<3d")
+ValueContentCodec = struct.Struct("<1d")
+HistoryContentCodec = struct.Struct("<1q")
+
+
+class ServerAPI:
+    def __init__(self, symbol, timeframe, logger, transport):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.logger = logger
+        self.transport = transport
+        self.reader = Reader(transport)
+
+    def __enter__(self):
+        self.transport.open()
+        self.logger.info(f"Server API {self.symbol} {self.timeframe}: Connected")
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.transport.close()
+        self.logger.info(f"Server API {self.symbol} {self.timeframe}: Disconnected")
+
+    def __pack(self, message):
+        self.transport.send(message)
+
+    def pack_shutdown(self):
+        self.__pack(HeaderCodec.pack(IdReceive.Shutdown.value))
+
+    def pack_complete(self):
+        self.__pack(HeaderCodec.pack(IdReceive.Complete.value))
+
+    def pack_account(self, balance, equity):
+        self.__pack(HeaderCodec.pack(IdReceive.Account.value) + AccountCodec.pack(balance, equity))
+
+    def pack_symbol(self, digits, pip_size, tick_size):
+        self.__pack(HeaderCodec.pack(IdReceive.Symbol.value) + SymbolCodec.pack(digits, pip_size, tick_size))
+
+    def pack_position(self, call, volume, entry, sl, tp):
+        sl = sl if sl is not None else Sentinel
+        tp = tp if tp is not None else Sentinel
+        self.__pack(HeaderCodec.pack(call.value) + PositionCodec.pack(volume, entry, sl, tp))
+
+    def pack_bar(self, date, open_price, high_price, low_price, close_price, volume):
+        self.__pack(HeaderCodec.pack(IdReceive.Bar.value) + BarCodec.pack(date, open_price, high_price, low_price, close_price, volume))
+
+    def pack_bar_batch(self, records):
+        records = np.ascontiguousarray(records, dtype=BarRecord)
+        self.__pack(HeaderCodec.pack(IdReceive.BarBatch.value) + CountCodec.pack(len(records)) + records.tobytes())
+
+    def pack_target(self, call, target):
+        self.__pack(HeaderCodec.pack(call.value) + TargetCodec.pack(target))
+
+    def unpack_header(self):
+        return IdSend(self.reader.unpack(HeaderCodec)[0])
+
+    def unpack_history(self):
+        call = self.unpack_header()
+        if call != IdSend.History:
+            raise ConnectionError(f"Expected {IdSend.History.name} handshake, received {call.name}")
+        last_date = self.reader.unpack(HistoryContentCodec)[0]
+        return last_date if last_date != Sentinel else None
+
+    def unpack_signal_fixed(self):
+        volume, sl_pips, tp_pips = self.reader.unpack(SignalContentCodec)
+        return volume, sl_pips if sl_pips != Sentinel else None, tp_pips if tp_pips != Sentinel else None
+
+    def unpack_signal_dynamic(self):
+        percentage, sl_pips, tp_pips = self.reader.unpack(SignalContentCodec)
+        return percentage, sl_pips, tp_pips if tp_pips != Sentinel else None
+
+    def unpack_obligatory_value(self):
+        return self.reader.unpack(ValueContentCodec)[0]
+
+    def unpack_optional_value(self):
+        value = self.reader.unpack(ValueContentCodec)[0]
+        return value if value != Sentinel else None
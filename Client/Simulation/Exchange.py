@@ -0,0 +1,212 @@
+import math
+import time
+import numpy as np
+
+from collections import deque
+
+from Strategy.Api import IdSend, IdReceive, BarRecord
+
+BarBatchSize = 4096
+
+
+def create_records(data):
+    records = np.empty(len(data), dtype=BarRecord)
+    records["Date"] = data.index.as_unit("ms").asi8
+    for column in BarRecord.names[1:]:
+        records[column] = data[column].to_numpy()
+    return records
+
+
+class Position:
+
+    def __init__(self, buy, volume, entry, stop_loss, take_profit):
+        self.buy = buy
+        self.volume = volume
+        self.entry = entry
+        self.stop_loss = stop_loss
+        self.take_profit = take_profit
+
+    def profit(self, price, volume):
+        return (price - self.entry) * volume if self.buy else (self.entry - price) * volume
+
+
+class Exchange:
+
+    def __init__(self, api, records, history, digits, pip_size, tick_size, logger, balance=10000.0, spread=0.0, volume_step=1000):
+        self.api = api
+        self.records = records
+        self.history = history
+        self.digits = digits
+        self.pip_size = pip_size
+        self.tick_size = tick_size
+        self.logger = logger
+        self.balance = balance
+        self.spread = spread * pip_size
+        self.volume_step = volume_step
+
+        self.bid = None
+        self.ask = None
+        self.position = None
+        self.last_ask_above_target = None
+        self.last_ask_below_target = None
+        self.last_bid_above_target = None
+        self.last_bid_below_target = None
+
+        self.events = deque()
+        self.latencies = {}
+        self.elapsed = None
+
+    def __call(self, call, pack, *args):
+        start = time.perf_counter_ns()
+        pack(*args)
+        self.handle_callback()
+        self.latencies.setdefault(call, []).append(time.perf_counter_ns() - start)
+
+    def __emit(self, call, *position):
+        self.events.append((call, self.api.pack_position, (call, *position)))
+
+    def __drain(self):
+        while self.events:
+            call, pack, args = self.events.popleft()
+            self.__call(call, pack, *args)
+
+    def __emit_position(self, buy_call, sell_call, position, volume=None):
+        call = buy_call if position.buy else sell_call
+        self.__emit(call, volume if volume is not None else position.volume, position.entry, position.stop_loss, position.take_profit)
+
+    def close_position(self, price=None):
+        if self.position is None:
+            return
+        position = self.position
+        self.balance += position.profit(price if price is not None else (self.bid if position.buy else self.ask), position.volume)
+        self.position = None
+        self.last_ask_above_target = None
+        self.last_ask_below_target = None
+        self.last_bid_above_target = None
+        self.last_bid_below_target = None
+        self.__emit_position(IdReceive.ClosedBuy, IdReceive.ClosedSell, position)
+
+    def open_position_fixed(self, buy, volume, sl_pips, tp_pips):
+        self.close_position()
+        if volume <= 0:
+            return
+        entry = self.ask if buy else self.bid
+        direction = 1 if buy else -1
+        stop_loss = entry - direction * sl_pips * self.pip_size if sl_pips is not None else None
+        take_profit = entry + direction * tp_pips * self.pip_size if tp_pips is not None else None
+        self.position = Position(buy, volume, entry, stop_loss, take_profit)
+        self.__emit_position(IdReceive.OpenedBuy, IdReceive.OpenedSell, self.position)
+
+    def open_position_dynamic(self, buy, percentage, sl_pips, tp_pips):
+        volume = self.normalize_volume(self.balance * percentage / 100 / (sl_pips * self.pip_size))
+        self.open_position_fixed(buy, volume, sl_pips, tp_pips)
+
+    def normalize_volume(self, volume):
+        return math.floor(volume / self.volume_step) * self.volume_step
+
+    def modify_volume(self, percentage):
+        if self.position is None:
+            return
+        volume = self.normalize_volume(self.position.volume * percentage / 100)
+        if volume <= 0 or volume == self.position.volume:
+            return
+        self.balance += self.position.profit(self.bid if self.position.buy else self.ask, self.position.volume - volume)
+        self.position.volume = volume
+        self.__emit_position(IdReceive.ModifiedBuyVolume, IdReceive.ModifiedSellVolume, self.position)
+
+    def modify_stop_loss(self, sl_price):
+        if self.position is None or self.position.stop_loss == sl_price:
+            return
+        self.position.stop_loss = sl_price
+        self.__emit_position(IdReceive.ModifiedBuyStopLoss, IdReceive.ModifiedSellStopLoss, self.position)
+
+    def modify_take_profit(self, tp_price):
+        if self.position is None or self.position.take_profit == tp_price:
+            return
+        self.position.take_profit = tp_price
+        self.__emit_position(IdReceive.ModifiedBuyTakeProfit, IdReceive.ModifiedSellTakeProfit, self.position)
+
+    def handle_callback(self):
+        call = self.api.unpack_header()
+        match call:
+            case IdSend.Complete:
+                pass
+            case IdSend.SignalBullishFixed:
+                self.open_position_fixed(True, *self.api.unpack_signal_fixed())
+            case IdSend.SignalBullishDynamic:
+                self.open_position_dynamic(True, *self.api.unpack_signal_dynamic())
+            case IdSend.SignalSideways:
+                self.close_position()
+            case IdSend.SignalBearishFixed:
+                self.open_position_fixed(False, *self.api.unpack_signal_fixed())
+            case IdSend.SignalBearishDynamic:
+                self.open_position_dynamic(False, *self.api.unpack_signal_dynamic())
+            case IdSend.ModifyVolume:
+                self.modify_volume(self.api.unpack_obligatory_value())
+            case IdSend.ModifyStopLoss:
+                self.modify_stop_loss(self.api.unpack_optional_value())
+            case IdSend.ModifyTakeProfit:
+                self.modify_take_profit(self.api.unpack_optional_value())
+            case IdSend.AskAboveTarget:
+                self.last_ask_above_target = self.api.unpack_optional_value()
+            case IdSend.AskBelowTarget:
+                self.last_ask_below_target = self.api.unpack_optional_value()
+            case IdSend.BidAboveTarget:
+                self.last_bid_above_target = self.api.unpack_optional_value()
+            case IdSend.BidBelowTarget:
+                self.last_bid_below_target = self.api.unpack_optional_value()
+
+    def on_tick(self, bid, ask):
+        self.bid = bid
+        self.ask = ask
+        position = self.position
+        if position is not None:
+            price = bid if position.buy else ask
+            direction = 1 if position.buy else -1
+            if position.stop_loss is not None and direction * (price - position.stop_loss) <= 0:
+                self.close_position(position.stop_loss)
+            elif position.take_profit is not None and direction * (price - position.take_profit) >= 0:
+                self.close_position(position.take_profit)
+        if self.last_ask_above_target is not None and ask >= self.last_ask_above_target:
+            self.__call(IdReceive.AskAboveTarget, self.api.pack_target, IdReceive.AskAboveTarget, ask)
+            self.last_ask_above_target = None
+        if self.last_ask_below_target is not None and ask <= self.last_ask_below_target:
+            self.__call(IdReceive.AskBelowTarget, self.api.pack_target, IdReceive.AskBelowTarget, ask)
+            self.last_ask_below_target = None
+        if self.last_bid_above_target is not None and bid >= self.last_bid_above_target:
+            self.__call(IdReceive.BidAboveTarget, self.api.pack_target, IdReceive.BidAboveTarget, bid)
+            self.last_bid_above_target = None
+        if self.last_bid_below_target is not None and bid <= self.last_bid_below_target:
+            self.__call(IdReceive.BidBelowTarget, self.api.pack_target, IdReceive.BidBelowTarget, bid)
+            self.last_bid_below_target = None
+        self.__drain()
+
+    def on_bar(self, record):
+        date, open_price, high_price, low_price, close_price, volume = record.tolist()
+        path = (open_price, low_price, high_price, close_price) if close_price >= open_price else (open_price, high_price, low_price, close_price)
+        for price in path:
+            self.on_tick(price, round(price + self.spread, self.digits))
+        self.__call(IdReceive.Bar, self.api.pack_bar, date, open_price, high_price, low_price, close_price, volume)
+        self.__drain()
+
+    def run(self):
+        last_date = self.api.unpack_history()
+        start = time.perf_counter()
+        self.__call(IdReceive.Account, self.api.pack_account, self.balance, self.balance)
+        self.__call(IdReceive.Symbol, self.api.pack_symbol, self.digits, self.pip_size, self.tick_size)
+        first = np.searchsorted(self.records["Date"][:self.history], last_date, side="right") if last_date is not None else 0
+        for i in range(first, self.history, BarBatchSize):
+            self.__call(IdReceive.BarBatch, self.api.pack_bar_batch, self.records[i:min(i + BarBatchSize, self.history)])
+        self.__call(IdReceive.Complete, self.api.pack_complete)
+        for record in self.records[self.history:]:
+            self.on_bar(record)
+        self.logger.warning("Shutdown simulation and safely terminate operations")
+        self.__call(IdReceive.Shutdown, self.api.pack_shutdown)
+        self.elapsed = time.perf_counter() - start
+
+    def report(self):
+        events = sum(len(latencies) for latencies in self.latencies.values())
+        self.logger.info(f"Exchange: [Events: {events} | Elapsed: {self.elapsed:.3f} secs | Throughput: {events / self.elapsed:.0f} events/sec | Balance: {self.balance:.2f}]")
+        for call, latencies in self.latencies.items():
+            latencies = np.array(latencies) / 1000
+            self.logger.info(f"Exchange {call.name}: [Count: {len(latencies)} | Mean: {latencies.mean():.1f} us | P50: {np.percentile(latencies, 50):.1f} us | P99: {np.percentile(latencies, 99):.1f} us]")
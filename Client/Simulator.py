@@ -0,0 +1,65 @@
+import os
+import argparse
+import tempfile
+import threading
+
+from Utility.Logger import Logger
+from Database.Database import Database
+from Simulation.Api import ServerAPI
+from Simulation.Exchange import Exchange, create_records
+from Strategy.Transport import LoopbackTransport, SocketTransport
+from Host import Strategies
+
+
+def symbol_specification(symbol):
+    return (3, 0.01, 0.001) if "JPY" in symbol else (5, 0.0001, 0.00001)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--strategy", type=str, help="Client strategy to simulate", required=True, choices=list(Strategies.keys()))
+    parser.add_argument("--symbol", type=str, help="Symbol in which the robot will operate", required=True)
+    parser.add_argument("--timeframe", type=str, help="Timeframe in which the robot will operate", required=True)
+    parser.add_argument("--verbose", type=str, help="Logging verbose level", default="Info", choices=["Error", "Warning", "Info", "Debug"])
+    parser.add_argument("--transport", type=str, help="Transport between exchange and client", default="Loopback", choices=["Loopback", "Socket"])
+    parser.add_argument("--start", type=str, help="First bar date to replay", default=None)
+    parser.add_argument("--end", type=str, help="Last bar date to replay", default=None)
+    parser.add_argument("--history", type=int, help="Bars replayed as history before trading", default=1000)
+    parser.add_argument("--balance", type=float, help="Initial account balance", default=10000.0)
+    parser.add_argument("--spread", type=float, help="Spread in pips between bid and ask", default=1.0)
+    args = parser.parse_args()
+
+    symbol = args.symbol.upper()
+    timeframe = args.timeframe.capitalize()
+    logger = Logger(args.verbose.upper())
+    iid = "Simulator"
+
+    source = Database("OHLCV", symbol, timeframe, logger)
+    records = create_records(source.load_data(start=args.start, end=args.end))
+    digits, pip_size, tick_size = symbol_specification(symbol)
+
+    with tempfile.TemporaryDirectory() as root:
+        db = Database("OHLCV", symbol, timeframe, logger, root=root)
+        match args.transport:
+            case "Loopback":
+                client, server = LoopbackTransport.pair()
+                listener = None
+            case "Socket":
+                address = os.path.join(root, f"{symbol}_{timeframe}_{iid}.sock")
+                client = SocketTransport(address)
+                listener = SocketTransport.listen(address)
+
+        strategy = Strategies[args.strategy](db, iid, symbol, timeframe, logger, client)
+        thread = threading.Thread(target=strategy.run, name=f"{args.strategy} {symbol} {timeframe}")
+        thread.start()
+        server = SocketTransport.accept(listener) if listener is not None else server
+
+        with ServerAPI(symbol, timeframe, logger, server) as api:
+            exchange = Exchange(api, records, min(args.history, len(records)), digits, pip_size, tick_size, logger, balance=args.balance, spread=args.spread)
+            exchange.run()
+            thread.join()
+        exchange.report()
+
+
+if __name__ == "__main__":
+    main()
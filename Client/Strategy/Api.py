@@ -1,9 +1,9 @@
 import struct
-import win32file
-import pywintypes
+import numpy as np
 
 from enum import Enum
-from datetime import datetime, timezone
+
+from .Transport import Reader
 
 
 class IdSend(Enum):
@@ -20,6 +20,7 @@ class IdSend(Enum):
     AskBelowTarget = 10
     BidAboveTarget = 11
     BidBelowTarget = 12
+    History = 13
 
 
 class IdReceive(Enum):
@@ -42,6 +43,7 @@ class IdReceive(Enum):
     AskBelowTarget = 16
     BidAboveTarget = 17
     BidBelowTarget = 18
+    BarBatch = 19
 
 
 class MarketDirection(Enum):
@@ -52,116 +54,220 @@ class MarketDirection(Enum):
 
 Sentinel = -1.0
 
+BarRecord = np.dtype([("Date", "<i8"), ("Open", "<f8"), ("High", "<f8"), ("Low", "<f8"), ("Close", "<f8"), ("Volume", "<i8")])
+
+HeaderCodec = struct.Struct("<1b")
+EmptyCodec = struct.Struct("<")
+AccountCodec = struct.Struct("<2d")
+SymbolCodec = struct.Struct("<1i2d")
+PositionCodec = struct.Struct("<4d")
+BarCodec = struct.Struct("<1q4d1q")
+TargetCodec = struct.Struct("<1d")
+CountCodec = struct.Struct("<1i")
+SignalCodec = struct.Struct("<1b3d")
+ValueCodec = struct.Struct("<1b1d")
+HistoryCodec = struct.Struct("<1b1q")
+
+CompleteMessage = HeaderCodec.pack(IdSend.Complete.value)
+
+ReceiveCodecs = {
+    IdReceive.Shutdown.value: EmptyCodec,
+    IdReceive.Complete.value: EmptyCodec,
+    IdReceive.Account.value: AccountCodec,
+    IdReceive.Symbol.value: SymbolCodec,
+    IdReceive.OpenedBuy.value: PositionCodec,
+    IdReceive.OpenedSell.value: PositionCodec,
+    IdReceive.ModifiedBuyVolume.value: PositionCodec,
+    IdReceive.ModifiedBuyStopLoss.value: PositionCodec,
+    IdReceive.ModifiedBuyTakeProfit.value: PositionCodec,
+    IdReceive.ModifiedSellVolume.value: PositionCodec,
+    IdReceive.ModifiedSellStopLoss.value: PositionCodec,
+    IdReceive.ModifiedSellTakeProfit.value: PositionCodec,
+    IdReceive.ClosedBuy.value: PositionCodec,
+    IdReceive.ClosedSell.value: PositionCodec,
+    IdReceive.Bar.value: BarCodec,
+    IdReceive.AskAboveTarget.value: TargetCodec,
+    IdReceive.AskBelowTarget.value: TargetCodec,
+    IdReceive.BidAboveTarget.value: TargetCodec,
+    IdReceive.BidBelowTarget.value: TargetCodec,
+    IdReceive.BarBatch.value: CountCodec,
+}
+
+SendCodecs = {
+    IdSend.Complete.value: HeaderCodec,
+    IdSend.SignalBullishFixed.value: SignalCodec,
+    IdSend.SignalBullishDynamic.value: SignalCodec,
+    IdSend.SignalSideways.value: HeaderCodec,
+    IdSend.SignalBearishFixed.value: SignalCodec,
+    IdSend.SignalBearishDynamic.value: SignalCodec,
+    IdSend.ModifyVolume.value: ValueCodec,
+    IdSend.ModifyStopLoss.value: ValueCodec,
+    IdSend.ModifyTakeProfit.value: ValueCodec,
+    IdSend.AskAboveTarget.value: ValueCodec,
+    IdSend.AskBelowTarget.value: ValueCodec,
+    IdSend.BidAboveTarget.value: ValueCodec,
+    IdSend.BidBelowTarget.value: ValueCodec,
+    IdSend.History.value: HistoryCodec,
+}
+
 
 class API:
-    def __init__(self, iid, symbol, timeframe, logger):
-        self.pipe = None
+    def __init__(self, iid, symbol, timeframe, logger, transport):
         self.iid = iid
         self.symbol = symbol
         self.timeframe = timeframe
         self.logger = logger
+        self.transport = transport
+        self.reader = Reader(transport)
+
+        self.decoders = {
+            IdReceive.Shutdown.value: self.unpack_empty,
+            IdReceive.Complete.value: self.unpack_empty,
+            IdReceive.Account.value: self.unpack_account,
+            IdReceive.Symbol.value: self.unpack_symbol,
+            IdReceive.OpenedBuy.value: self.unpack_position,
+            IdReceive.OpenedSell.value: self.unpack_position,
+            IdReceive.ModifiedBuyVolume.value: self.unpack_position,
+            IdReceive.ModifiedBuyStopLoss.value: self.unpack_position,
+            IdReceive.ModifiedBuyTakeProfit.value: self.unpack_position,
+            IdReceive.ModifiedSellVolume.value: self.unpack_position,
+            IdReceive.ModifiedSellStopLoss.value: self.unpack_position,
+            IdReceive.ModifiedSellTakeProfit.value: self.unpack_position,
+            IdReceive.ClosedBuy.value: self.unpack_position,
+            IdReceive.ClosedSell.value: self.unpack_position,
+            IdReceive.Bar.value: self.unpack_bar,
+            IdReceive.AskAboveTarget.value: self.unpack_target,
+            IdReceive.AskBelowTarget.value: self.unpack_target,
+            IdReceive.BidAboveTarget.value: self.unpack_target,
+            IdReceive.BidBelowTarget.value: self.unpack_target,
+            IdReceive.BarBatch.value: self.unpack_bar_batch,
+        }
+
+        self.encoders = {
+            IdSend.Complete.value: self.pack_complete,
+            IdSend.SignalBullishFixed.value: self.pack_signal_bullish_fixed,
+            IdSend.SignalBullishDynamic.value: self.pack_signal_bullish_dynamic,
+            IdSend.SignalSideways.value: self.pack_signal_sideways,
+            IdSend.SignalBearishFixed.value: self.pack_signal_bearish_fixed,
+            IdSend.SignalBearishDynamic.value: self.pack_signal_bearish_dynamic,
+            IdSend.ModifyVolume.value: self.pack_modify_volume,
+            IdSend.ModifyStopLoss.value: self.pack_modify_stop_loss,
+            IdSend.ModifyTakeProfit.value: self.pack_modify_take_profit,
+            IdSend.AskAboveTarget.value: self.pack_ask_above_target,
+            IdSend.AskBelowTarget.value: self.pack_ask_below_target,
+            IdSend.BidAboveTarget.value: self.pack_bid_above_target,
+            IdSend.BidBelowTarget.value: self.pack_bid_below_target,
+            IdSend.History.value: self.pack_history,
+        }
 
     def __enter__(self):
         try:
-            self.pipe = win32file.CreateFile(f"\\\\.\\pipe\\{self.symbol}\\{self.timeframe}\\{self.iid}",
-                                             win32file.GENERIC_READ | win32file.GENERIC_WRITE, 0, None,
-                                             win32file.OPEN_EXISTING, 0, None)
+            self.transport.open()
             self.logger.info(f"API {self.symbol} {self.timeframe}: Connected")
-        except pywintypes.error as e:
-            if e.winerror == 2:
-                self.logger.error(f"API {self.symbol} {self.timeframe}: Unable to connect")
-            elif e.winerror == 231:
-                self.logger.error(f"API {self.symbol} {self.timeframe}: Another client is connected")
+        except FileNotFoundError:
+            self.logger.error(f"API {self.symbol} {self.timeframe}: Unable to connect")
+            raise
+        except ConnectionRefusedError:
+            self.logger.error(f"API {self.symbol} {self.timeframe}: Another client is connected")
             raise
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.pipe:
-            win32file.CloseHandle(self.pipe)
-            self.logger.info(f"API {self.symbol} {self.timeframe}: Disconnected")
+        self.transport.close()
+        self.logger.info(f"API {self.symbol} {self.timeframe}: Disconnected")
 
     def __pack(self, message):
-        win32file.WriteFile(self.pipe, message)
+        self.transport.send(message)
 
     def pack_complete(self):
-        self.__pack(struct.pack("<1b", IdSend.Complete.value))
+        self.__pack(CompleteMessage)
 
     def pack_signal_bullish_fixed(self, volume, sl_pips, tp_pips):
         sl_pips = sl_pips if sl_pips is not None else Sentinel
         tp_pips = tp_pips if tp_pips is not None else Sentinel
-        self.__pack(struct.pack("<1b3d", IdSend.SignalBullishFixed.value, volume, sl_pips, tp_pips))
+        self.__pack(SignalCodec.pack(IdSend.SignalBullishFixed.value, volume, sl_pips, tp_pips))
 
     def pack_signal_bullish_dynamic(self, percentage, sl_pips, tp_pips):
         tp_pips = tp_pips if tp_pips is not None else Sentinel
-        self.__pack(struct.pack("<1b3d", IdSend.SignalBullishDynamic.value, percentage, sl_pips, tp_pips))
+        self.__pack(SignalCodec.pack(IdSend.SignalBullishDynamic.value, percentage, sl_pips, tp_pips))
 
     def pack_signal_sideways(self):
-        self.__pack(struct.pack("<1b", IdSend.SignalSideways.value))
+        self.__pack(HeaderCodec.pack(IdSend.SignalSideways.value))
 
     def pack_signal_bearish_fixed(self, volume, sl_pips, tp_pips):
         sl_pips = sl_pips if sl_pips is not None else Sentinel
         tp_pips = tp_pips if tp_pips is not None else Sentinel
-        self.__pack(struct.pack("<1b3d", IdSend.SignalBearishFixed.value, volume, sl_pips, tp_pips))
+        self.__pack(SignalCodec.pack(IdSend.SignalBearishFixed.value, volume, sl_pips, tp_pips))
 
     def pack_signal_bearish_dynamic(self, volume, sl_pips, tp_pips):
         tp_pips = tp_pips if tp_pips is not None else Sentinel
-        self.__pack(struct.pack("<1b3d", IdSend.SignalBearishDynamic.value, volume, sl_pips, tp_pips))
+        self.__pack(SignalCodec.pack(IdSend.SignalBearishDynamic.value, volume, sl_pips, tp_pips))
 
     def pack_modify_volume(self, volume):
-        self.__pack(struct.pack("<1b1d", IdSend.ModifyVolume.value, volume))
+        self.__pack(ValueCodec.pack(IdSend.ModifyVolume.value, volume))
 
     def pack_modify_stop_loss(self, sl_price):
         sl_price = sl_price if sl_price is not None else Sentinel
-        self.__pack(struct.pack("<1b1d", IdSend.ModifyStopLoss.value, sl_price))
+        self.__pack(ValueCodec.pack(IdSend.ModifyStopLoss.value, sl_price))
 
     def pack_modify_take_profit(self, tp_price):
         tp_price = tp_price if tp_price is not None else Sentinel
-        self.__pack(struct.pack("<1b1d", IdSend.ModifyTakeProfit.value, tp_price))
+        self.__pack(ValueCodec.pack(IdSend.ModifyTakeProfit.value, tp_price))
 
     def pack_ask_above_target(self, target):
         target = target if target is not None else Sentinel
-        self.__pack(struct.pack("<1b1d", IdSend.AskAboveTarget.value, target))
+        self.__pack(ValueCodec.pack(IdSend.AskAboveTarget.value, target))
 
     def pack_ask_below_target(self, target):
         target = target if target is not None else Sentinel
-        self.__pack(struct.pack("<1b1d", IdSend.AskBelowTarget.value, target))
+        self.__pack(ValueCodec.pack(IdSend.AskBelowTarget.value, target))
 
     def pack_bid_above_target(self, target):
         target = target if target is not None else Sentinel
-        self.__pack(struct.pack("<1b1d", IdSend.BidAboveTarget.value, target))
+        self.__pack(ValueCodec.pack(IdSend.BidAboveTarget.value, target))
 
     def pack_bid_below_target(self, target):
         target = target if target is not None else Sentinel
-        self.__pack(struct.pack("<1b1d", IdSend.BidBelowTarget.value, target))
+        self.__pack(ValueCodec.pack(IdSend.BidBelowTarget.value, target))
 
-    def __unpack(self, size):
-        buffer = win32file.AllocateReadBuffer(struct.calcsize(size))
-        _, content = win32file.ReadFile(self.pipe, buffer)
-        return struct.unpack(size, content)
+    def pack_history(self, last_date):
+        last_date = round(last_date.timestamp() * 1000) if last_date is not None else int(Sentinel)
+        self.__pack(HistoryCodec.pack(IdSend.History.value, last_date))
+
+    async def receive(self):
+        await self.reader.fill(HeaderCodec.size)
+        call = self.reader.peek(HeaderCodec)[0]
+        size = HeaderCodec.size + ReceiveCodecs[call].size
+        await self.reader.fill(size)
+        if call == IdReceive.BarBatch.value:
+            size += self.reader.peek(CountCodec, HeaderCodec.size)[0] * BarRecord.itemsize
+            await self.reader.fill(size)
 
     def unpack_header(self):
-        return self.__unpack("<1b")[0]
+        return self.reader.unpack(HeaderCodec)[0]
+
+    def unpack_empty(self):
+        return ()
 
     def unpack_account(self):
-        content = self.__unpack(size="<2d")
-        return content[0], content[1]
+        return self.reader.unpack(AccountCodec)
 
     def unpack_symbol(self):
-        content = self.__unpack(size="<1i2d")
-        return content[0], content[1], content[2]
+        return self.reader.unpack(SymbolCodec)
 
     def unpack_position(self):
-        content = self.__unpack(size="<4d")
-        sl = content[2]
-        tp = content[3]
-        sl = sl if sl is not Sentinel else None
-        tp = tp if tp is not Sentinel else None
-        return content[0], content[1], sl, tp,
+        volume, entry, sl, tp = self.reader.unpack(PositionCodec)
+        sl = sl if sl != Sentinel else None
+        tp = tp if tp != Sentinel else None
+        return volume, entry, sl, tp
 
     def unpack_bar(self):
-        content = self.__unpack(size="<1q4d1q")
-        date = datetime.fromtimestamp(content[0] / 1000.0, tz=timezone.utc)
-        return date, content[1], content[2], content[3], content[4], content[5]
+        return self.reader.unpack(BarCodec)
 
     def unpack_target(self):
-        return self.__unpack(size="<1d")[0]
+        return self.reader.unpack(TargetCodec)
+
+    def unpack_bar_batch(self):
+        count = self.reader.unpack(CountCodec)[0]
+        records = np.frombuffer(self.reader.read(count * BarRecord.itemsize), dtype=BarRecord)
+        return tuple(np.ascontiguousarray(records[column]) for column in BarRecord.names)
@@ -1,8 +1,9 @@
-from .State import State
-from .Transition import Transition
+from .Api import IdReceive
+from .State import State, Transitions
 
 
 class Machine:
+    __slots__ = ("name", "symbol", "timeframe", "logger", "states", "position", "table")
 
     def __init__(self, name, symbol, timeframe, logger):
         self.name = name
@@ -10,76 +11,104 @@ class Machine:
         self.timeframe = timeframe
         self.logger = logger
 
-        self.at = None
         self.states = []
+        self.position = None
+        self.table = None
+
+    @property
+    def at(self):
+        return self.states[self.position] if self.position is not None else None
+
+    @at.setter
+    def at(self, state):
+        self.position = state.index
 
     def create_state(self, name, end) -> State:
         state = State(name, end)
+        state.index = len(self.states)
         self.states.append(state)
-        self.at = state if not self.at else self.at
+        self.position = state.index if self.position is None else self.position
+        self.table = None
         return state
 
-    def __call(self, transition: Transition, *args):
+    def compile(self):
+        rows = []
+        for state in self.states:
+            transitions = (getattr(state, attribute) for attribute in Transitions)
+            rows.append(tuple((transition.action, transition.to.index, self.__message(state, transition)) if transition is not None else None for transition in transitions))
+        self.table = tuple(rows)
+        return self
+
+    def __message(self, state, transition):
+        return f"Machine {self.name}: [{state.name}] > {transition.reason} > [{transition.to.name}]" if transition.reason is not None else None
+
+    def call(self, event, *args):
+        table = self.table if self.table is not None else self.compile().table
+        transition = table[self.position][event]
         if transition is not None:
-            ret = transition.perform_action(*args)
-            if transition.reason is not None:
-                self.logger.info(f"Machine {self.name}: [{self.at.name}] > {transition.reason} > [{transition.to.name}]")
-            self.at = transition.to
+            action, to, message = transition
+            ret = action(*args) if action is not None else None
+            if message is not None:
+                self.logger.info(message)
+            self.position = to
             return ret
 
     def call_shutdown(self):
-        return self.__call(self.at.shutdown_transition)
+        return self.call(IdReceive.Shutdown.value)
 
     def call_complete(self):
-        return self.__call(self.at.complete_transition)
+        return self.call(IdReceive.Complete.value)
 
     def call_account(self, *account):
-        return self.__call(self.at.account_transition, *account)
+        return self.call(IdReceive.Account.value, *account)
 
     def call_symbol(self, *symbol):
-        return self.__call(self.at.symbol_transition, *symbol)
+        return self.call(IdReceive.Symbol.value, *symbol)
 
     def call_opened_buy(self, *position):
-        return self.__call(self.at.opened_buy_transition, *position)
+        return self.call(IdReceive.OpenedBuy.value, *position)
 
     def call_opened_sell(self, *position):
-        return self.__call(self.at.opened_sell_transition, *position)
+        return self.call(IdReceive.OpenedSell.value, *position)
 
     def call_modified_buy_volume(self, *position):
-        return self.__call(self.at.modified_buy_volume_transition, *position)
+        return self.call(IdReceive.ModifiedBuyVolume.value, *position)
 
     def call_modified_buy_stop_loss(self, *position):
-        return self.__call(self.at.modified_buy_stop_loss_transition, *position)
+        return self.call(IdReceive.ModifiedBuyStopLoss.value, *position)
 
     def call_modified_buy_take_profit(self, *position):
-        return self.__call(self.at.modified_buy_take_profit_transition, *position)
+        return self.call(IdReceive.ModifiedBuyTakeProfit.value, *position)
 
     def call_modified_sell_volume(self, *position):
-        return self.__call(self.at.modified_sell_volume_transition, *position)
+        return self.call(IdReceive.ModifiedSellVolume.value, *position)
 
     def call_modified_sell_stop_loss(self, *position):
-        return self.__call(self.at.modified_sell_stop_loss_transition, *position)
+        return self.call(IdReceive.ModifiedSellStopLoss.value, *position)
 
     def call_modified_sell_take_profit(self, *position):
-        return self.__call(self.at.modified_sell_take_profit_transition, *position)
+        return self.call(IdReceive.ModifiedSellTakeProfit.value, *position)
 
     def call_closed_buy(self, *position):
-        return self.__call(self.at.closed_buy_transition, *position)
+        return self.call(IdReceive.ClosedBuy.value, *position)
 
     def call_closed_sell(self, *position):
-        return self.__call(self.at.closed_sell_transition, *position)
+        return self.call(IdReceive.ClosedSell.value, *position)
 
     def call_bar(self, *bar):
-        return self.__call(self.at.bar_transition, *bar)
+        return self.call(IdReceive.Bar.value, *bar)
 
     def call_ask_above_target(self, *target):
-        return self.__call(self.at.ask_above_target_transition, *target)
+        return self.call(IdReceive.AskAboveTarget.value, *target)
 
     def call_ask_below_target(self, *target):
-        return self.__call(self.at.ask_below_target_transition, *target)
+        return self.call(IdReceive.AskBelowTarget.value, *target)
 
     def call_bid_above_target(self, *target):
-        return self.__call(self.at.bid_above_target_transition, *target)
+        return self.call(IdReceive.BidAboveTarget.value, *target)
 
     def call_bid_below_target(self, *target):
-        return self.__call(self.at.bid_below_target_transition, *target)
+        return self.call(IdReceive.BidBelowTarget.value, *target)
+
+    def call_bars(self, *bars):
+        return self.call(IdReceive.BarBatch.value, *bars)
@@ -1,11 +1,36 @@
 from .Transition import Transition
 
+Transitions = (
+    "shutdown_transition",
+    "complete_transition",
+    "account_transition",
+    "symbol_transition",
+    "opened_buy_transition",
+    "opened_sell_transition",
+    "modified_buy_volume_transition",
+    "modified_buy_stop_loss_transition",
+    "modified_buy_take_profit_transition",
+    "modified_sell_volume_transition",
+    "modified_sell_stop_loss_transition",
+    "modified_sell_take_profit_transition",
+    "closed_buy_transition",
+    "closed_sell_transition",
+    "bar_transition",
+    "ask_above_target_transition",
+    "ask_below_target_transition",
+    "bid_above_target_transition",
+    "bid_below_target_transition",
+    "bars_transition",
+)
+
 
 class State:
+    __slots__ = ("name", "end", "index", *Transitions)
 
     def __init__(self, name, end):
         self.name = name
         self.end = end
+        self.index = None
 
         self.shutdown_transition = None
         self.complete_transition = None
@@ -26,6 +51,7 @@ class State:
         self.ask_below_target_transition = None
         self.bid_above_target_transition = None
         self.bid_below_target_transition = None
+        self.bars_transition = None
 
     def on_shutdown(self, action, to, reason):
         self.shutdown_transition = Transition(action, to, reason)
@@ -83,3 +109,6 @@ class State:
 
     def on_bid_below_target(self, action, to, reason):
         self.bid_below_target_transition = Transition(action, to, reason)
+
+    def on_bars(self, action, to, reason):
+        self.bars_transition = Transition(action, to, reason)
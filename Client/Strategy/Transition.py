@@ -1,4 +1,5 @@
 class Transition:
+    __slots__ = ("action", "to", "reason")
 
     def __init__(self, action, to, reason):
         self.action = action
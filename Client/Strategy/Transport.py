@@ -0,0 +1,274 @@
+import os
+import sys
+import socket
+import asyncio
+import tempfile
+import threading
+
+from abc import ABC, abstractmethod
+
+
+class Transport(ABC):
+
+    def __init__(self, address):
+        self.address = address
+        self.queue = None
+        self.remainder = memoryview(b"")
+
+    @abstractmethod
+    def open(self):
+        pass
+
+    @abstractmethod
+    def close(self):
+        pass
+
+    @abstractmethod
+    def recv_into(self, view):
+        pass
+
+    @abstractmethod
+    def send(self, message):
+        pass
+
+    async def receive_into(self, view):
+        if self.queue is None:
+            self.queue = asyncio.Queue()
+            threading.Thread(target=self.pump, args=(asyncio.get_running_loop(), self.queue), name=f"Transport {self.address}", daemon=True).start()
+        if not self.remainder:
+            content = await self.queue.get()
+            if isinstance(content, BaseException):
+                raise content
+            self.remainder = memoryview(content)
+        size = min(len(view), len(self.remainder))
+        view[:size] = self.remainder[:size]
+        self.remainder = self.remainder[size:]
+        return size
+
+    def pump(self, loop, queue, size=65536):
+        view = memoryview(bytearray(size))
+        while True:
+            try:
+                content = bytes(view[:self.recv_into(view)])
+            except Exception as e:
+                content = e
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, content)
+            except RuntimeError:
+                return
+            if not isinstance(content, bytes) or not content:
+                return
+
+    async def drain(self):
+        pass
+
+
+class PipeTransport(Transport):
+
+    def __init__(self, address):
+        super().__init__(address)
+        self.handle = None
+
+    def open(self):
+        import win32file
+        import pywintypes
+        try:
+            self.handle = win32file.CreateFile(self.address, win32file.GENERIC_READ | win32file.GENERIC_WRITE, 0, None, win32file.OPEN_EXISTING, 0, None)
+        except pywintypes.error as e:
+            if e.winerror == 2:
+                raise FileNotFoundError(self.address) from e
+            if e.winerror == 231:
+                raise ConnectionRefusedError(self.address) from e
+            raise
+
+    def close(self):
+        import win32file
+        if self.handle:
+            win32file.CloseHandle(self.handle)
+            self.handle = None
+
+    def recv_into(self, view):
+        import win32file
+        _, content = win32file.ReadFile(self.handle, len(view))
+        view[:len(content)] = content
+        return len(content)
+
+    def send(self, message):
+        import win32file
+        win32file.WriteFile(self.handle, message)
+
+
+class SocketTransport(Transport):
+
+    def __init__(self, address, connection=None):
+        super().__init__(address)
+        self.connection = connection
+        self.outgoing = None
+
+    @staticmethod
+    def listen(address):
+        if os.path.exists(address):
+            os.remove(address)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(address)
+        listener.listen(1)
+        return listener
+
+    @classmethod
+    def accept(cls, listener):
+        address = listener.getsockname()
+        with listener:
+            connection, _ = listener.accept()
+        os.remove(address)
+        return cls(address, connection)
+
+    def open(self):
+        if self.connection is None:
+            self.connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.connection.connect(self.address)
+
+    def close(self):
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+    def recv_into(self, view):
+        return self.connection.recv_into(view)
+
+    def send(self, message):
+        if self.outgoing is not None:
+            self.outgoing += message
+            return
+        self.connection.sendall(message)
+
+    async def receive_into(self, view):
+        if self.outgoing is None:
+            self.connection.setblocking(False)
+            self.outgoing = bytearray()
+        return await asyncio.get_running_loop().sock_recv_into(self.connection, view)
+
+    async def drain(self):
+        if self.outgoing:
+            message, self.outgoing = bytes(self.outgoing), bytearray()
+            await asyncio.get_running_loop().sock_sendall(self.connection, message)
+
+
+class Channel:
+
+    def __init__(self):
+        self.content = bytearray()
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def write(self, message):
+        with self.condition:
+            self.content += message
+            self.condition.notify()
+
+    def read_into(self, view):
+        with self.condition:
+            while not self.content and not self.closed:
+                self.condition.wait()
+            size = min(len(view), len(self.content))
+            view[:size] = self.content[:size]
+            del self.content[:size]
+            return size
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+
+class LoopbackTransport(Transport):
+
+    def __init__(self, incoming, outgoing):
+        super().__init__("loopback")
+        self.incoming = incoming
+        self.outgoing = outgoing
+
+    @classmethod
+    def pair(cls):
+        forward, backward = Channel(), Channel()
+        return cls(forward, backward), cls(backward, forward)
+
+    def open(self):
+        pass
+
+    def close(self):
+        self.outgoing.close()
+
+    def recv_into(self, view):
+        return self.incoming.read_into(view)
+
+    def send(self, message):
+        self.outgoing.write(message)
+
+
+class Reader:
+
+    def __init__(self, transport, size=65536):
+        self.transport = transport
+        self.buffer = bytearray(size)
+        self.view = memoryview(self.buffer)
+        self.start = 0
+        self.end = 0
+
+    def __reserve(self, size):
+        available = self.end - self.start
+        if not available:
+            self.start = self.end = 0
+        if self.start + size > len(self.buffer):
+            if size > len(self.buffer):
+                buffer = bytearray(max(size, 2 * len(self.buffer)))
+                buffer[:available] = self.view[self.start:self.end]
+                self.buffer = buffer
+                self.view = memoryview(buffer)
+            else:
+                self.buffer[:available] = bytes(self.view[self.start:self.end])
+            self.start, self.end = 0, available
+
+    def __fill(self, size):
+        if self.end - self.start >= size:
+            return
+        self.__reserve(size)
+        while self.end - self.start < size:
+            count = self.transport.recv_into(self.view[self.end:])
+            if not count:
+                raise ConnectionResetError(self.transport.address)
+            self.end += count
+
+    async def fill(self, size):
+        if self.end - self.start >= size:
+            return
+        self.__reserve(size)
+        while self.end - self.start < size:
+            count = await self.transport.receive_into(self.view[self.end:])
+            if not count:
+                raise ConnectionResetError(self.transport.address)
+            self.end += count
+
+    def peek(self, codec, offset=0):
+        return codec.unpack_from(self.buffer, self.start + offset)
+
+    def unpack(self, codec):
+        self.__fill(codec.size)
+        content = codec.unpack_from(self.buffer, self.start)
+        self.start += codec.size
+        return content
+
+    def read(self, size):
+        self.__fill(size)
+        view = self.view[self.start:self.start + size]
+        self.start += size
+        return view
+
+
+def create_transport(kind, iid, symbol, timeframe):
+    kind = kind or ("Pipe" if sys.platform == "win32" else "Socket")
+    match kind:
+        case "Pipe":
+            return PipeTransport(f"\\\\.\\pipe\\{symbol}\\{timeframe}\\{iid}")
+        case "Socket":
+            return SocketTransport(os.path.join(tempfile.gettempdir(), f"{symbol}_{timeframe}_{iid}.sock"))
+    raise ValueError(f"Unknown transport {kind}")
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Utility.Logger import Logger
+from Strategy.Api import API, IdReceive, IdSend, BarRecord, Sentinel, ReceiveCodecs, SendCodecs, HeaderCodec
+from Strategy.Transport import LoopbackTransport
+from Simulation.Api import ServerAPI
+
+
+@pytest.fixture
+def apis():
+    logger = Logger("ERROR")
+    client, server = LoopbackTransport.pair()
+    return API("0", "EURUSD", "Hour", logger, client), ServerAPI("EURUSD", "Hour", logger, server)
+
+
+def receive(client):
+    call = client.unpack_header()
+    return call, client.decoders[call]()
+
+
+def test_every_call_has_a_codec():
+    assert set(ReceiveCodecs) == {call.value for call in IdReceive}
+    assert set(SendCodecs) == {call.value for call in IdSend}
+
+
+@pytest.mark.parametrize("sl, tp", [(1.05, 1.15), (None, None), (1.05, None)])
+def test_position_round_trip(apis, sl, tp):
+    client, server = apis
+    server.pack_position(IdReceive.OpenedBuy, 0.5, 1.1, sl, tp)
+    assert receive(client) == (IdReceive.OpenedBuy.value, (0.5, 1.1, sl, tp))
+
+
+def test_receive_round_trip(apis):
+    client, server = apis
+    server.pack_account(1000.0, 1012.5)
+    server.pack_symbol(5, 0.0001, 0.00001)
+    server.pack_bar(1_700_000_000_000, 1.1, 1.2, 1.0, 1.15, 42)
+    server.pack_target(IdReceive.BidBelowTarget, 1.0875)
+    server.pack_complete()
+    server.pack_shutdown()
+
+    assert receive(client) == (IdReceive.Account.value, (1000.0, 1012.5))
+    assert receive(client) == (IdReceive.Symbol.value, (5, 0.0001, 0.00001))
+    assert receive(client) == (IdReceive.Bar.value, (1_700_000_000_000, 1.1, 1.2, 1.0, 1.15, 42))
+    assert receive(client) == (IdReceive.BidBelowTarget.value, (1.0875,))
+    assert receive(client) == (IdReceive.Complete.value, ())
+    assert receive(client) == (IdReceive.Shutdown.value, ())
+
+
+@pytest.mark.parametrize("count", [0, 1, 5000])
+def test_bar_batch_round_trip(apis, count):
+    client, server = apis
+    records = np.zeros(count, dtype=BarRecord)
+    records["Date"] = 1_700_000_000_000 + 3_600_000 * np.arange(count)
+    for name in ("Open", "High", "Low", "Close"):
+        records[name] = np.random.default_rng(count).random(count)
+    records["Volume"] = np.arange(count)
+    server.pack_bar_batch(records)
+
+    call, columns = receive(client)
+    assert call == IdReceive.BarBatch.value
+    assert len(columns) == len(BarRecord.names)
+    for name, column in zip(BarRecord.names, columns):
+        assert column.dtype == BarRecord[name]
+        np.testing.assert_array_equal(column, records[name])
+
+
+def test_send_round_trip(apis):
+    client, server = apis
+    client.pack_signal_bullish_fixed(0.1, 20.0, None)
+    client.pack_signal_bearish_fixed(0.2, None, None)
+    client.pack_signal_bullish_dynamic(1.5, 25.0, 50.0)
+    client.pack_modify_volume(0.3)
+    client.pack_modify_stop_loss(None)
+    client.pack_bid_above_target(1.2)
+    client.pack_signal_sideways()
+    client.pack_complete()
+
+    assert server.unpack_header() == IdSend.SignalBullishFixed
+    assert server.unpack_signal_fixed() == (0.1, 20.0, None)
+    assert server.unpack_header() == IdSend.SignalBearishFixed
+    assert server.unpack_signal_fixed() == (0.2, None, None)
+    assert server.unpack_header() == IdSend.SignalBullishDynamic
+    assert server.unpack_signal_dynamic() == (1.5, 25.0, 50.0)
+    assert server.unpack_header() == IdSend.ModifyVolume
+    assert server.unpack_obligatory_value() == 0.3
+    assert server.unpack_header() == IdSend.ModifyStopLoss
+    assert server.unpack_optional_value() is None
+    assert server.unpack_header() == IdSend.BidAboveTarget
+    assert server.unpack_optional_value() == 1.2
+    assert server.unpack_header() == IdSend.SignalSideways
+    assert server.unpack_header() == IdSend.Complete
+
+
+@pytest.mark.parametrize("last_date", [pd.Timestamp("2024-03-01 13:00", tz="UTC"), None])
+def test_history_round_trip(apis, last_date):
+    client, server = apis
+    client.pack_history(last_date)
+    expected = round(last_date.timestamp() * 1000) if last_date is not None else None
+    assert server.unpack_history() == expected
@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from Utility.Logger import Logger
+from Database.Database import Database
+
+
+@pytest.fixture(scope="module")
+def history():
+    return Database("OHLCV", "EURUSD", "Hour", Logger("ERROR")).load_data(tail=2000)
+
+
+def assert_frame_equal(actual, expected):
+    pd.testing.assert_frame_equal(actual, expected, check_freq=False, check_index_type=False)
+
+
+def test_overlapping_saves_replace_rows(tmp_path, history):
+    db = Database("OHLCV", "EURUSD", "Hour", Logger("ERROR"), root=str(tmp_path))
+    revised = history.iloc[1200:1600].copy()
+    revised["Close"] += 1.0
+    db.save_data(history.iloc[:1500])
+    db.save_data(revised)
+    db.save_data(history.iloc[1550:])
+
+    expected = pd.concat([history.iloc[:1200], revised.iloc[:350], history.iloc[1550:]])
+    assert_frame_equal(db.load_data(), expected)
+    assert db.last_date() == history.index[-1]
+
+
+def test_slices_match_pandas(tmp_path, history):
+    db = Database("OHLCV", "EURUSD", "Hour", Logger("ERROR"), root=str(tmp_path))
+    db.save_data(history.iloc[:1000])
+    db.save_data(history.iloc[800:])
+    start, end = history.index[300], history.index[1700]
+
+    assert_frame_equal(db.load_data(start=start), history.loc[start:])
+    assert_frame_equal(db.load_data(end=end), history.loc[:end])
+    assert_frame_equal(db.load_data(start=start, end=end), history.loc[start:end])
+    assert_frame_equal(db.load_data(start=start + pd.Timedelta(minutes=30), end=end - pd.Timedelta(minutes=30)), history.loc[start + pd.Timedelta(minutes=30):end - pd.Timedelta(minutes=30)])
+    assert_frame_equal(db.load_data(head=50), history.iloc[:50])
+    assert_frame_equal(db.load_data(tail=50), history.iloc[-50:])
+    assert_frame_equal(db.load_data(end=end, tail=100), history.loc[:end].iloc[-100:])
+    assert_frame_equal(db.load_data(start=start, head=100), history.loc[start:].iloc[:100])
+    assert_frame_equal(db.load_data(start=start, end=end, columns=["Close", "Volume"]), history.loc[start:end, ["Close", "Volume"]])
+    assert db.load_data(start=history.index[-1] + pd.Timedelta(hours=1)).empty
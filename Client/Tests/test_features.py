@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from Utility.Logger import Logger
+from Database.Database import Database
+from Database.Features import FeatureStore
+from Database.Technical import Indicators, StreamWindow, offline_technical
+
+Columns = ["SMA20", "WMA50", "TRIMA20", "EMA50", "KAMA20", "RSI", "ATR", "MACDOSC", "AD", "OBV", "STDDEV"]
+
+
+@pytest.fixture(scope="module")
+def history():
+    return Database("OHLCV", "EURUSD", "Hour", Logger("ERROR")).load_data(tail=3000)
+
+
+def assert_recomputed(actual, expected, indicators, market):
+    np.testing.assert_array_equal(actual.index.as_unit("ms").asi8, expected.index.as_unit("ms").asi8)
+    for column, indicator in indicators.items():
+        # Bounded columns only differ by talib's running-sum rounding, the rest by what leaks past the convergence window;
+        # talib accumulates raw prices, so the rounding is relative to the price level even for small outputs like STDDEV
+        tolerance = 1e-12 if StreamWindow.bounded(indicator) else 1e-9
+        scale = max(np.nanmax(np.abs(expected[column].to_numpy())), market.Close.max())
+        np.testing.assert_allclose(actual[column].to_numpy(), expected[column].to_numpy(), rtol=tolerance, atol=tolerance * scale, err_msg=column)
+
+
+def test_incremental_updates_match_full_recompute(tmp_path, history):
+    logger = Logger("ERROR")
+    indicators = {column: Indicators[column] for column in Columns}
+    db = Database("OHLCV", "EURUSD", "Hour", logger, root=str(tmp_path))
+    db.save_data(history.iloc[:2000])
+    features = FeatureStore(db, indicators, logger)
+    features.load_data()
+    for start in range(1950, len(history), 250):
+        features.save_data(history.iloc[start:start + 300])
+
+    actual = features.load_data()
+    expected = offline_technical(history, indicators)
+    assert_recomputed(actual, expected, indicators, history)
+
+
+def test_load_data_catches_up_with_market(tmp_path, history):
+    logger = Logger("ERROR")
+    indicators = {column: Indicators[column] for column in Columns}
+    db = Database("OHLCV", "EURUSD", "Hour", logger, root=str(tmp_path))
+    db.save_data(history.iloc[:2500])
+    features = FeatureStore(db, indicators, logger)
+    features.load_data()
+    db.save_data(history.iloc[2500:])
+
+    actual = features.load_data(start=history.index[2500])
+    expected = offline_technical(history, indicators).loc[history.index[2500]:]
+    assert_recomputed(actual, expected, indicators, history)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from Utility.Logger import Logger
+from Database.Database import Database
+from Database.Technical import StreamTechnical, offline_technical
+from Strategy.Transport import LoopbackTransport
+from NNFX import NNFX
+
+Streamed = 250
+
+
+@pytest.fixture(scope="module")
+def history():
+    return Database("OHLCV", "EURUSD", "Hour", Logger("ERROR")).load_data(tail=3000)
+
+
+def create_strategy(root):
+    logger = Logger("ERROR")
+    client, _ = LoopbackTransport.pair()
+    strategy = NNFX(Database("OHLCV", "EURUSD", "Hour", logger, root=root), "0", "EURUSD", "Hour", logger, client)
+    strategy.symbol_pip_size = 0.0001
+    return strategy
+
+
+def stream(strategy, bars):
+    for timestamp, bar in zip(bars.index.as_unit("ms").asi8, bars.itertuples(index=False, name=None)):
+        strategy.process_signal_action(int(timestamp), *bar)
+
+
+def assert_offline_parity(strategy, history):
+    expected = offline_technical(history, strategy.indicators).iloc[-strategy.window_size:]
+    window = strategy.indicator_window.to_frame()
+    np.testing.assert_array_equal(window.index.as_unit("ms").asi8, expected.index.as_unit("ms").asi8)
+    np.testing.assert_array_equal(window.to_numpy(), expected.to_numpy())
+
+
+def test_cold_start_streams_offline_values(tmp_path, history):
+    strategy = create_strategy(str(tmp_path))
+    strategy.db.save_data(history.iloc[:-Streamed])
+    strategy.prepare_data_action()
+    assert_offline_parity(strategy, history.iloc[:-Streamed])
+
+    stream(strategy, history.iloc[-Streamed:])
+    assert_offline_parity(strategy, history)
+    strategy.save_data_action()
+
+
+def test_restore_streams_offline_values(tmp_path, history, monkeypatch):
+    strategy = create_strategy(str(tmp_path))
+    strategy.db.save_data(history.iloc[:-Streamed])
+    strategy.prepare_data_action()
+    stream(strategy, history.iloc[-Streamed:-100])
+    strategy.save_data_action()
+
+    def warm(self, market_data):
+        raise AssertionError("restore replayed history instead of loading the snapshot")
+
+    monkeypatch.setattr(StreamTechnical, "warm", warm)
+    strategy.db.save_data(history.iloc[-100:-50])
+    restored = create_strategy(str(tmp_path))
+    restored.prepare_data_action()
+    assert_offline_parity(restored, history.iloc[:-50])
+
+    stream(restored, history.iloc[-50:])
+    assert_offline_parity(restored, history)
+    restored.save_data_action()
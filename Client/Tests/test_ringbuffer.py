@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Utility.RingBuffer import RingBuffer
+
+Size = 8
+
+
+def fill(buffer, count):
+    for i in range(count):
+        buffer.append(1_600_000_000_000 + 3_600_000 * i, (float(i), 10.0 * i))
+    return buffer
+
+
+@pytest.mark.parametrize("count", [0, 3, Size, Size + 3, 5 * Size + 1])
+def test_state_round_trip(count):
+    buffer = fill(RingBuffer(["Value", "Scaled"], Size, {"Value": np.dtype(float), "Scaled": np.dtype(float)}), count)
+    restored = RingBuffer.from_state(buffer.state(), Size)
+
+    assert len(restored) == len(buffer) == min(count, Size)
+    np.testing.assert_array_equal(restored.last_dates(), buffer.last_dates())
+    np.testing.assert_array_equal(restored.last(), buffer.last())
+    np.testing.assert_array_equal(restored.last(), np.array([(float(i), 10.0 * i) for i in range(max(count - Size, 0), count)]).reshape(-1, 2))
+    pd.testing.assert_frame_equal(restored.to_frame(), buffer.to_frame())
+
+
+def test_restored_buffer_keeps_wrapping():
+    buffer = fill(RingBuffer(["Value", "Scaled"], Size), Size + 5)
+    restored = RingBuffer.from_state(buffer.state(), Size)
+    for i in range(Size + 5, 3 * Size):
+        buffer.append(1_600_000_000_000 + 3_600_000 * i, (float(i), 10.0 * i))
+        restored.append(1_600_000_000_000 + 3_600_000 * i, (float(i), 10.0 * i))
+        np.testing.assert_array_equal(restored.last(3), buffer.last(3))
+        np.testing.assert_array_equal(restored.last_dates(3), buffer.last_dates(3))
+
+
+def test_from_frame_keeps_dtypes():
+    index = pd.date_range("2024-01-01", periods=2 * Size, freq="h", tz="UTC", name="Date")
+    data = pd.DataFrame({"Close": np.arange(2 * Size, dtype=float), "Volume": np.arange(2 * Size, dtype=np.int64)}, index=index)
+    buffer = RingBuffer.from_frame(data, Size)
+    restored = RingBuffer.from_state(buffer.state(), Size)
+    pd.testing.assert_frame_equal(restored.to_frame(), data.iloc[-Size:], check_freq=False, check_index_type=False)
@@ -0,0 +1,44 @@
+import talib
+import warnings
+import numpy as np
+import pytest
+
+from backtesting import Backtest
+
+from Utility.Logger import Logger
+from Database.Database import Database
+from Optimisation.Optimisation import Optimisation
+from Optimisation.Vectorized import VectorizedBacktest
+from Optimisation.Baseline import BaselineIndicators, BaselineStrategy
+
+Step = 15
+
+
+@pytest.fixture(scope="module")
+def data():
+    return Database("OHLCV", "EURUSD", "Hour", Logger("ERROR")).load_data(tail=2000)
+
+
+@pytest.mark.parametrize("indicator", [indicator for indicator in BaselineIndicators if all(isinstance(values, range) for values in indicator["ranges"].values())], ids=lambda indicator: indicator["name"])
+def test_vectorized_matches_backtest(data, indicator):
+    parameter, values = next(iter(indicator["ranges"].items()))
+    values = values[::Step]
+    close = data.Close.to_numpy(dtype=float)
+    atr = talib.ATR(data.High.to_numpy(dtype=float), data.Low.to_numpy(dtype=float), close, timeperiod=BaselineStrategy.atr_timeperiod)
+    engine = VectorizedBacktest(data, Optimisation.capital)
+    result = engine.run(np.column_stack([getattr(talib, indicator["name"])(close, **{parameter: value}) for value in values]), int(np.isnan(atr).argmin()))
+
+    Optimisation.configure_strategy(BaselineStrategy, indicator)
+    backtest = Backtest(data=data, strategy=BaselineStrategy, cash=Optimisation.capital)
+    for column, value in enumerate(values):
+        actual = engine.stats(result, column, {parameter: value})
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            expected = backtest.run(**{parameter: value})
+        for key, statistic in actual.items():
+            if key.startswith("_"):
+                continue
+            if isinstance(statistic, float):
+                np.testing.assert_allclose(statistic, expected[key], rtol=1e-9, atol=1e-9, err_msg=f"{key} {parameter}={value}")
+            else:
+                assert statistic == expected[key], f"{key} {parameter}={value}"
@@ -2,17 +2,21 @@ import logging
 
 
 class Logger:
-    def __init__(self, verbose):
+    def __init__(self, verbose, name=None):
         self.verbose = verbose
+        self.name = name
         self.logger = self.create_logger()
 
     def create_logger(self):
-        logger = logging.getLogger(__name__)
+        logger = logging.getLogger(__name__ if self.name is None else f"{__name__}.{self.name}")
         logger.setLevel(self.verbose)
-        console_handler = logging.StreamHandler()
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        if self.name is not None:
+            logger.propagate = False
+        if not logger.handlers:
+            console_handler = logging.StreamHandler()
+            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s' if self.name is None else f'%(asctime)s - {self.name} - %(levelname)s - %(message)s')
+            console_handler.setFormatter(formatter)
+            logger.addHandler(console_handler)
         return logger
 
     def debug(self, message):
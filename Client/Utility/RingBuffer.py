@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+
+class RingBuffer:
+    __slots__ = ("names", "index", "dtypes", "size", "count", "dates", "values")
+
+    def __init__(self, names, size, dtypes=None):
+        self.names = list(names)
+        self.dtypes = dtypes
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.size = size
+        self.count = 0
+        self.dates = np.zeros(2 * size, dtype=np.int64)
+        self.values = np.full((2 * size, len(self.names)), np.nan)
+
+    @classmethod
+    def from_frame(cls, data, size):
+        buffer = cls(data.columns, size, data.dtypes.to_dict())
+        dates = data.index.as_unit("ms").asi8
+        values = data.to_numpy(dtype=float)
+        for date, row in zip(dates[-size:], values[-size:]):
+            buffer.append(date, row)
+        return buffer
+
+    @classmethod
+    def from_state(cls, state, size):
+        names = state["Names"].tolist()
+        buffer = cls(names, size, dict(zip(names, state["Types"].tolist())))
+        for date, row in zip(state["Dates"], state["Values"]):
+            buffer.append(date, row)
+        return buffer
+
+    def state(self):
+        return {"Names": np.array(self.names, dtype=str), "Types": np.array([str(self.dtypes[name]) if self.dtypes is not None else "float64" for name in self.names], dtype=str),
+                "Dates": self.last_dates().copy(), "Values": self.last().copy()}
+
+    def __len__(self):
+        return min(self.count, self.size)
+
+    def append(self, date, row):
+        position = self.count % self.size
+        self.dates[position] = self.dates[position + self.size] = date
+        self.values[position] = self.values[position + self.size] = row
+        self.count += 1
+
+    def __bounds(self, n):
+        n = len(self) if n is None else min(n, len(self))
+        end = self.count % self.size + self.size if self.count >= self.size else self.size + self.count
+        return end - n, end
+
+    def last(self, n=None):
+        start, end = self.__bounds(n)
+        return self.values[start:end]
+
+    def last_dates(self, n=None):
+        start, end = self.__bounds(n)
+        return self.dates[start:end]
+
+    def to_frame(self, n=None):
+        return self.frame(self.last_dates(n), self.last(n).copy())
+
+    def frame(self, dates, values):
+        index = pd.DatetimeIndex(dates.view("datetime64[ms]"), name="Date").tz_localize("UTC")
+        data = pd.DataFrame(values, index=index, columns=self.names)
+        return data.astype(self.dtypes) if self.dtypes is not None else data
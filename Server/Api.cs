@@ -34,7 +34,8 @@ public class Api
         AskAboveTarget = 15,
         AskBelowTarget = 16,
         BidAboveTarget = 17,
-        BidBelowTarget = 18
+        BidBelowTarget = 18,
+        BarBatch = 19
     }
 
     public enum IdReceive
@@ -51,7 +52,8 @@ public class Api
         AskAboveTarget = 9,
         AskBelowTarget = 10,
         BidAboveTarget = 11,
-        BidBelowTarget = 12
+        BidBelowTarget = 12,
+        History = 13
     }
 
     private const double Sentinel = -1.0;
@@ -163,6 +165,25 @@ public class Api
         Pack(memoryStream.ToArray());
     }
 
+    public void PackBarBatch(Bars bars, int start, int count)
+    {
+        using var memoryStream = new MemoryStream();
+        using var writer = new BinaryWriter(memoryStream);
+        writer.Write((byte)IdSend.BarBatch);
+        writer.Write(count);
+        for (var i = start; i < start + count; i++)
+        {
+            var bar = bars[i];
+            writer.Write(((DateTimeOffset)bar.OpenTime).ToUnixTimeMilliseconds());
+            writer.Write(bar.Open);
+            writer.Write(bar.High);
+            writer.Write(bar.Low);
+            writer.Write(bar.Close);
+            writer.Write(bar.TickVolume);
+        }
+        Pack(memoryStream.ToArray());
+    }
+
     private void PackTarget(IdSend targetType, double target)
     {
         using var memoryStream = new MemoryStream();
@@ -216,6 +237,13 @@ public class Api
         return volume;
     }
 
+    public long? UnpackHistory()
+    {
+        var content = Unpack(1 * sizeof(long));
+        var lastDate = BitConverter.ToInt64(content, 0);
+        return lastDate == (long)Sentinel ? null : lastDate;
+    }
+
     public double? UnpackOptionalValue()
     {
         var content = Unpack(1 * sizeof(double));
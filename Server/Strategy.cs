@@ -8,6 +8,8 @@ namespace cAlgo.Robots;
 
 public abstract class Strategy
 {
+    private const int BarBatchSize = 4096;
+
     private readonly Api _api;
     private readonly Logger _logger;
     private readonly Robot _robot;
@@ -35,6 +37,7 @@ public abstract class Strategy
     private void CallClosedBuy(Position position) { _api.PackClosedBuy(position); HandleCallback(); }
     private void CallClosedSell(Position position) { _api.PackClosedSell(position); HandleCallback(); }
     private void CallBar(Bar bar) { _api.PackBar(bar); HandleCallback(); }
+    private void CallBarBatch(Bars bars, int start, int count) { _api.PackBarBatch(bars, start, count); HandleCallback(); }
     private void CallAskAboveTarget(double ask) { _api.PackAskAboveTarget(ask); HandleCallback(); }
     private void CallAskBelowTarget(double ask) { _api.PackAskBelowTarget(ask); HandleCallback(); }
     private void CallBidAboveTarget(double bid) { _api.PackBidAboveTarget(bid); HandleCallback(); }
@@ -97,6 +100,21 @@ public abstract class Strategy
         _robot.ModifyPosition(position, position.StopLoss, tpPrice);
     }
 
+    private long? HandleHistory()
+    {
+        var call = _api.UnpackHeader();
+        if (call != Api.IdReceive.History) throw new InvalidOperationException($"Expected History handshake, received {call}");
+        return _api.UnpackHistory();
+    }
+
+    private int FirstBarAfter(long? lastDate)
+    {
+        if (lastDate is null) return 0;
+        var first = _robot.Bars.Count - 1;
+        while (first > 0 && ((DateTimeOffset)_robot.Bars[first - 1].OpenTime).ToUnixTimeMilliseconds() > lastDate) first--;
+        return first;
+    }
+
     private void HandleCallback()
     {
         var call = _api.UnpackHeader();
@@ -173,9 +191,11 @@ public abstract class Strategy
 
         _api.Connect();
 
+        var first = FirstBarAfter(HandleHistory());
+        _logger.Info($"Strategy {_robot.SymbolName} {_robot.TimeFrame.Name}: History from bar {first} of {_robot.Bars.Count-1}");
         CallAccount(_robot.Account);
         CallSymbol(_robot.Symbol);
-        for (var i = 0; i < _robot.Bars.Count-1; i++) { CallBar(_robot.Bars[i]); }
+        for (var i = first; i < _robot.Bars.Count-1; i += BarBatchSize) { CallBarBatch(_robot.Bars, i, Math.Min(BarBatchSize, _robot.Bars.Count-1-i)); }
         CallComplete();
     }
 